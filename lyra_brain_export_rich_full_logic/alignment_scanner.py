@@ -3,40 +3,280 @@
 # -----------------------------
 # Scans memory images or glyph maps for signs of padding, encryption,
 # fragmentation, or ghosted key space.
+#
+# Two ways in: load() + the per-analysis methods hold the whole image in
+# memory, while scan_stream() runs all four analyses in one pass over
+# fixed-size chunks read from disk, so memory stays bounded by the chunk
+# size rather than the image size. scan_images() farms those chunks (of
+# one image or many) out to a process pool and merges them back in order.
+#
+# CLI: python alignment_scanner.py <image or dir> ... [--workers N]
+#      [--chunk-size BYTES] [--json]
 
 import os
+import json
 import math
+import multiprocessing
+import re
+from collections import Counter
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 64 * 2**20
+KEY_WINDOW = 32      # Bytes per candidate key window
+KEY_DISTINCT = 24    # A window with more distinct bytes than this looks random
+FENCE_MARKERS = {
+    "a137": b'\xA1\x37\x00\x00',
+    "deadbeef": b'\xDE\xAD\xBE\xEF',
+}
+FIND_MARKERS = 8  # Up to this many markers get a bytes.find loop each; more share one regex pass
+HISTOGRAM_SLICE = 1 << 16  # bincount widens uint8 to intp; slicing keeps that copy in cache
+KEY_SLICE = 1 << 16        # Window starts scored per vectorized pass in the key scan
+PROFILE_BLOCK = 4096
+PROFILE_BATCH = 1 << 20    # Bytes histogrammed per bincount in the entropy profile
+
+
+def byte_histogram(data):
+    # int64[256] byte counts of any buffer, without a Python-level loop
+    view = np.frombuffer(data, dtype=np.uint8)
+    byte_freq = np.zeros(256, dtype=np.int64)
+    for i in range(0, len(view), HISTOGRAM_SLICE):
+        byte_freq += np.bincount(view[i:i + HISTOGRAM_SLICE], minlength=256)
+    return byte_freq
+
+
+def histogram_entropy(byte_freq, total):
+    counts = np.asarray(byte_freq)
+    p = counts[counts > 0] / total
+    return float(-(p * np.log2(p)).sum()) + 0.0  # A single byte value sums to -0.0
+
+
+class EntropyProfile:
+    """
+    Sliding-window Shannon entropy, fed a buffer at a time.
+    One value per block_size-byte window, windows starting every `step`
+    bytes (step divides block_size; defaults to block_size). Each window's
+    histogram is the previous one plus the incoming step and minus the
+    outgoing one, done as a prefix sum over per-step histograms.
+    """
+    def __init__(self, block_size=PROFILE_BLOCK, step=None):
+        step = step or block_size
+        if block_size % step:
+            raise ValueError("step must divide block_size")
+        self.block_size = block_size
+        self.step = step
+        self.span = block_size // step
+        self._carry = np.zeros((0, 256), dtype=np.int64)  # Last span - 1 step histograms
+        self._tail = b""  # Bytes short of a whole step
+        self._parts = []
+        # c * log2(c) for every count a window can hold
+        counts = np.arange(block_size + 1, dtype=np.float64)
+        self._clog = counts * np.log2(np.maximum(counts, 1))
+
+    def feed(self, data):
+        if self._tail:
+            data = self._tail + bytes(data)
+        view = np.frombuffer(data, dtype=np.uint8)
+        whole = len(view) // self.step * self.step
+        self._tail = bytes(view[whole:])
+        batch = max(1, PROFILE_BATCH // self.step) * self.step
+        for i in range(0, whole, batch):
+            steps = view[i:min(i + batch, whole)].reshape(-1, self.step)
+            # Offset each step's bytes into its own 256-bin row, then count them all at once
+            bins = steps + (np.arange(len(steps), dtype=np.intp) * 256)[:, None]
+            per_step = np.bincount(bins.ravel(), minlength=len(steps) * 256).reshape(-1, 256)
+            per_step = np.concatenate((self._carry, per_step))
+            self._carry = per_step[max(0, len(per_step) - self.span + 1):]
+            if len(per_step) < self.span:
+                continue
+            if self.span == 1:
+                windows = per_step
+            else:
+                running = np.zeros((len(per_step) + 1, 256), dtype=np.int64)
+                np.cumsum(per_step, axis=0, out=running[1:])
+                windows = running[self.span:] - running[:-self.span]
+            entropy = math.log2(self.block_size) - self._clog[windows].sum(axis=1) / self.block_size
+            np.maximum(entropy, 0.0, out=entropy)  # Rounding can dip a constant window below zero
+            self._parts.append(entropy.astype(np.float32))
+        return self
+
+    def values(self):
+        # float32 entropy (bits per byte) of each whole window so far
+        if not self._parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._parts)
+
+
+def entropy_profile(data, block_size=PROFILE_BLOCK, step=None):
+    return EntropyProfile(block_size, step).feed(data).values()
+
+
+def distinct_counts(data, window=KEY_WINDOW):
+    """
+    Distinct byte count of every window-byte window of data, in O(n).
+    This is the rolling counter (one byte in, one byte out) done in bulk:
+    byte j is counted by window i when j is the last occurrence of its
+    value inside the window, i.e. for every i in [j - window + 1, j] with
+    i <= next[j] - window, where next[j] is the next index holding the same
+    byte. Those ranges go into a difference array that one cumsum resolves.
+    """
+    view = np.frombuffer(data, dtype=np.uint8)
+    n = len(view)
+    windows = n - window + 1
+    if windows <= 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(view, kind="stable").astype(np.int32)  # Radix sort for uint8, so still linear
+    following = np.empty(n, dtype=np.int32)
+    following[order[:-1]] = np.where(view[order[1:]] == view[order[:-1]], order[1:], n + window)
+    following[order[-1]] = n + window
+    j = np.arange(n, dtype=np.int32)
+    lo = np.maximum(j - (window - 1), 0)
+    hi = np.minimum(np.minimum(j, following - window), windows - 1)
+    np.maximum(hi, lo - 1, out=hi)  # An empty range adds and removes at the same index
+    diff = np.bincount(lo, minlength=windows + 1) - np.bincount(hi + 1, minlength=windows + 1)
+    return np.cumsum(diff[:windows])
+
+
+def add_range(ranges, start, end):
+    # Appends [start, end) to sorted ranges, joining it to the last one when they touch
+    if ranges and start <= ranges[-1][1]:
+        ranges[-1] = (ranges[-1][0], max(end, ranges[-1][1]))
+    else:
+        ranges.append((start, end))
+
+
+def key_ranges(data, starts, base=0, window=KEY_WINDOW, distinct=KEY_DISTINCT, ranges=None):
+    """
+    High-randomness windows (more than `distinct` distinct bytes) starting
+    before `starts`, as merged (start, end) byte ranges offset by base.
+    Returns (ranges, number of windows hit); pass ranges to extend a list.
+    """
+    ranges = [] if ranges is None else ranges
+    hits = 0
+    for lo in range(0, starts, KEY_SLICE):
+        count = min(KEY_SLICE, starts - lo)
+        flagged = np.flatnonzero(distinct_counts(memoryview(data)[lo:lo + count + window - 1], window) > distinct)
+        if not len(flagged):
+            continue
+        hits += len(flagged)
+        # Hit windows whose bytes overlap or touch form one range
+        breaks = np.flatnonzero(np.diff(flagged) > window) + 1
+        firsts = flagged[np.concatenate(([0], breaks))] + base + lo
+        lasts = flagged[np.concatenate((breaks - 1, [len(flagged) - 1]))] + base + lo + window
+        for start, end in zip(firsts.tolist(), lasts.tolist()):
+            add_range(ranges, start, end)
+    return ranges, hits
+
+
+def fence_anchor(marker):
+    # (offset, piece): the longest stretch of marker free of null bytes. Finding
+    # that instead of the whole marker keeps bytes.find skipping through
+    # zero padding, where a trailing \x00 would match at every offset.
+    pieces = marker.split(b"\x00")
+    piece = max(pieces, key=len)
+    if not piece:
+        return 0, marker
+    return marker.index(piece), piece
+
+
+def fence_pattern(markers):
+    # Literal alternation; re skips ahead on the set of first bytes
+    alternatives = sorted(set(markers.values()), key=len, reverse=True)
+    return re.compile(b"|".join(map(re.escape, alternatives)))
+
+
+def fence_matches(data, starts, base=0, markers=FENCE_MARKERS, pattern=None):
+    """
+    {marker name: offsets} of every marker occurrence starting before
+    `starts`, offset by base. Markers may have any length and may overlap.
+    Small marker sets scan with bytes.find per marker; larger ones with one
+    regex (pattern, from fence_pattern) that restarts a byte past each hit,
+    so overlapping markers are all checked at every candidate.
+    """
+    found = {name: [] for name in markers}
+    if len(markers) <= FIND_MARKERS:
+        for name, marker in markers.items():
+            hits = found[name]
+            offset, piece = fence_anchor(marker)
+            end = starts + offset + len(piece) - 1
+            i = data.find(piece, offset, end)
+            while i != -1:
+                if data.startswith(marker, i - offset):
+                    hits.append(base + i - offset)
+                i = data.find(piece, i + 1, end)
+        return found
+    pattern = pattern or fence_pattern(markers)
+    by_first = {}
+    for name, marker in markers.items():
+        by_first.setdefault(marker[0], []).append((name, marker))
+    longest = max(map(len, markers.values()))
+    end = starts + longest - 1
+    match = pattern.search(data, 0, end)
+    while match and match.start() < starts:
+        i = match.start()
+        for name, marker in by_first[data[i]]:
+            if data.startswith(marker, i):
+                found[name].append(base + i)
+        match = pattern.search(data, i + 1, end)
+    return found
+
+
+def fence_offsets(found):
+    # Sorted distinct offsets across every marker
+    return sorted(set().union(*found.values()))
+
 
 class AlignmentScanner:
-    def __init__(self, filepath):
+    def __init__(self, filepath, key_window=KEY_WINDOW, key_distinct=KEY_DISTINCT, fence_markers=None):
         self.filepath = filepath
+        self.key_window = key_window      # Bytes per candidate key window
+        self.key_distinct = key_distinct  # Distinct bytes a window must exceed to count
+        self.fence_markers = dict(fence_markers or FENCE_MARKERS)  # name -> marker bytes
+        self._fence_pattern = fence_pattern(self.fence_markers) if len(self.fence_markers) > FIND_MARKERS else None
         self.byte_data = None
+        self.size = 0
         self.entropy = 0.0
+        self.entropy_profile = None
         self.null_blocks = 0
-        self.potential_keys = []
-        self.fragment_zones = []
+        self.potential_keys = []  # Merged (start, end) byte ranges of high-randomness windows
+        self.key_hits = 0         # Windows that passed the distinctness test
+        self.fragment_zones = []  # Sorted offsets of every fence marker
+        self.fences = {}          # Marker name -> offsets
+        self._byte_freq = None    # Histogram merged so far by a chunked scan
 
     def load(self):
         with open(self.filepath, "rb") as f:
             self.byte_data = f.read()
+        self.size = len(self.byte_data)
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, overlap=0):
+        # (offset, block) pairs; each block runs `overlap` bytes into the next
+        # chunk so windows straddling a chunk edge are seen whole
+        with open(self.filepath, "rb") as f:
+            start = 0
+            while True:
+                f.seek(start)
+                block = f.read(chunk_size + overlap)
+                if not block:
+                    return
+                yield start, block
+                if len(block) <= chunk_size:
+                    return
+                start += chunk_size
 
     def calculate_entropy(self):
         if not self.byte_data:
             return 0.0
 
-        byte_freq = [0] * 256
-        for b in self.byte_data:
-            byte_freq[b] += 1
-
         total = len(self.byte_data)
-        entropy = 0
-        for count in byte_freq:
-            if count > 0:
-                p = count / total
-                entropy -= p * math.log2(p)
-        self.entropy = round(entropy, 4)
+        self.entropy = round(histogram_entropy(byte_histogram(self.byte_data), total), 4)
         return self.entropy
 
+    def calculate_entropy_profile(self, block_size=PROFILE_BLOCK, step=None):
+        # Per-window entropy; runs near 8 bits/byte mark encrypted or compressed regions
+        self.entropy_profile = entropy_profile(self.byte_data or b"", block_size, step)
+        return self.entropy_profile
+
     def detect_null_blocks(self):
         count = self.byte_data.count(b"\x00")
         self.null_blocks = count
@@ -44,40 +284,213 @@ class AlignmentScanner:
 
     def scan_for_key_shapes(self):
         # Look for common 16 or 32 byte patterns (AES/RSA/xor style)
-        size = len(self.byte_data)
-        for i in range(size - 32):
-            segment = self.byte_data[i:i+32]
-            if len(set(segment)) > 24:  # high randomness
-                self.potential_keys.append((i, segment))
+        starts = max(0, len(self.byte_data) - self.key_window + 1)
+        self.potential_keys, self.key_hits = key_ranges(self.byte_data, starts, 0, self.key_window, self.key_distinct)
         return len(self.potential_keys)
 
+    def key_view(self, key_range):
+        # Bytes of one potential key range: a memoryview into the loaded image,
+        # or read from disk after a streaming scan
+        start, end = key_range
+        if self.byte_data is not None:
+            return memoryview(self.byte_data)[start:end]
+        with open(self.filepath, "rb") as f:
+            f.seek(start)
+            return memoryview(f.read(end - start))
+
     def find_fragment_boundaries(self):
         # Look for marker patterns or high-entropy fences
-        for i in range(len(self.byte_data)-4):
-            block = self.byte_data[i:i+4]
-            if block in [b'\xA1\x37\x00\x00', b'\xDE\xAD\xBE\xEF']:
-                self.fragment_zones.append(i)
+        self.fences = fence_matches(self.byte_data, len(self.byte_data), 0, self.fence_markers, self._fence_pattern)
+        self.fragment_zones = fence_offsets(self.fences)
         return self.fragment_zones
 
-    def run_full_scan(self):
-        self.load()
-        print(f"[✓] Loaded {len(self.byte_data)} bytes")
-        print(f"🔐 Entropy: {self.calculate_entropy()}")
-        print(f"🧊 Null bytes: {self.detect_null_blocks()}")
-        print(f"🧬 Potential keys: {self.scan_for_key_shapes()}")
-        print(f"🚧 Fragment fences: {self.find_fragment_boundaries()}")
+    def overlap(self):
+        # Bytes a chunk must read past its end for edge windows and markers
+        return max(self.key_window, *map(len, self.fence_markers.values())) - 1
+
+    def jobs(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        # One picklable job per chunk, for scan_block in a worker process
+        settings = (self.key_window, self.key_distinct, self.fence_markers)
+        size = os.path.getsize(self.filepath)
+        return [(self.filepath, start, chunk_size, size, settings) for start in range(0, size, chunk_size)] or \
+               [(self.filepath, 0, chunk_size, 0, settings)]
+
+    def scan_block(self, start, block, own, size):
+        """
+        Partial results for the chunk of `own` bytes at `start` (block holds
+        the overlap after it). A chunk owns the windows that start inside it;
+        the overlap only lets its last windows read past the edge.
+        """
+        key_starts = max(0, min(own, size - self.key_window + 1 - start))
+        key_hits = key_ranges(block, key_starts, start, self.key_window, self.key_distinct)
         return {
+            "start": start,
+            "histogram": byte_histogram(memoryview(block)[:own]),
+            "key_ranges": key_hits[0],
+            "key_hits": key_hits[1],
+            "fences": fence_matches(block, own, start, self.fence_markers, self._fence_pattern),
+        }
+
+    def begin(self):
+        # Clears results ahead of merging chunk partials
+        self.size = os.path.getsize(self.filepath)
+        self._byte_freq = np.zeros(256, dtype=np.int64)
+        self.potential_keys = []
+        self.key_hits = 0
+        self.fragment_zones = []
+        self.fences = {name: [] for name in self.fence_markers}
+
+    def merge(self, partial):
+        # Folds in the next chunk's partial results; chunks must come in file order
+        self._byte_freq += partial["histogram"]
+        for start, end in partial["key_ranges"]:
+            add_range(self.potential_keys, start, end)  # Joins ranges across the chunk edge
+        self.key_hits += partial["key_hits"]
+        for name, offsets in partial["fences"].items():
+            self.fences[name].extend(offsets)
+        self.fragment_zones.extend(fence_offsets(partial["fences"]))
+
+    def finish(self):
+        self.null_blocks = int(self._byte_freq[0])
+        self.entropy = round(histogram_entropy(self._byte_freq, self.size), 4) if self.size else 0.0
+        return self.report()
+
+    def scan_stream(self, chunk_size=DEFAULT_CHUNK_SIZE, profile_block=None, profile_step=None):
+        # Entropy, null count, key shapes and fences in one pass over the file
+        self.begin()
+        profile = EntropyProfile(profile_block, profile_step) if profile_block else None
+        for start, block in self.iter_chunks(chunk_size, self.overlap()):
+            own = min(chunk_size, len(block))
+            self.merge(self.scan_block(start, block, own, self.size))
+            if profile is not None:
+                profile.feed(memoryview(block)[:own])
+        if profile is not None:
+            self.entropy_profile = profile.values()
+        return self.finish()
+
+    def scan_parallel(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        # scan_stream with the chunks spread over a process pool
+        for _ in scan_images([self], workers, chunk_size):
+            pass
+        return self.report()
+
+    def report(self):
+        report = {
             "entropy": self.entropy,
             "null_blocks": self.null_blocks,
             "potential_keys": self.potential_keys,
-            "fragment_zones": self.fragment_zones
+            "key_hits": self.key_hits,
+            "fragment_zones": self.fragment_zones,
+            "fences": self.fences
         }
+        if self.entropy_profile is not None:
+            report["entropy_profile"] = self.entropy_profile
+        return report
+
+    def json_report(self):
+        report = dict(self.report(), path=self.filepath, size=self.size)
+        report["potential_keys"] = [list(key_range) for key_range in self.potential_keys]
+        if self.entropy_profile is not None:
+            report["entropy_profile"] = self.entropy_profile.tolist()
+        return json.dumps(report)
+
+    def print_summary(self, how):
+        print(f"[✓] {how} {self.size} bytes")
+        print(f"🔐 Entropy: {self.entropy}")
+        print(f"🧊 Null bytes: {self.null_blocks}")
+        print(f"🧬 Potential keys: {len(self.potential_keys)} ranges ({self.key_hits} windows)")
+        print(f"🚧 Fragment fences: { {name: len(offsets) for name, offsets in self.fences.items()} }")
+
+    def scan(self, chunk_size=None, workers=None):
+        # chunk_size streams the image instead of loading it whole; workers > 1
+        # spreads the chunks over processes
+        if workers and workers > 1:
+            return self.scan_parallel(workers, chunk_size or DEFAULT_CHUNK_SIZE)
+        if chunk_size:
+            return self.scan_stream(chunk_size)
+        self.load()
+        self.calculate_entropy()
+        self.detect_null_blocks()
+        self.scan_for_key_shapes()
+        self.find_fragment_boundaries()
+        return self.report()
+
+    def run_full_scan(self, chunk_size=None, workers=None):
+        self.scan(chunk_size, workers)
+        if workers and workers > 1:
+            self.print_summary(f"Scanned with {workers} workers:")
+        elif chunk_size:
+            self.print_summary(f"Streamed in {chunk_size}-byte chunks:")
+        else:
+            self.print_summary("Loaded")
+        return self.report()
+
+
+def _scan_job(job):
+    # Worker side of scan_images: reads one chunk plus its overlap and scans it
+    filepath, start, chunk_size, size, (key_window, key_distinct, fence_markers) = job
+    scanner = AlignmentScanner(filepath, key_window, key_distinct, fence_markers)
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        block = f.read(chunk_size + scanner.overlap())
+    return scanner.scan_block(start, block, min(chunk_size, len(block)), size)
+
+
+def scan_images(scanners, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Scans every scanner's image in chunks on one process pool, yielding
+    each scanner as its report completes, in the order given. Chunk
+    partials come back in file order and are merged as they arrive, so
+    ranges and markers join up across chunk edges.
+    """
+    jobs = []
+    for index, scanner in enumerate(scanners):
+        scanner.begin()
+        jobs.extend((index, job) for job in scanner.jobs(chunk_size))
+    remaining = Counter(index for index, _ in jobs)
+    with multiprocessing.Pool(workers) as pool:
+        partials = pool.imap(_scan_job, (job for _, job in jobs))
+        for (index, _), partial in zip(jobs, partials):
+            scanners[index].merge(partial)
+            remaining[index] -= 1
+            if not remaining[index]:
+                scanners[index].finish()
+                yield scanners[index]
+
+
+def image_paths(paths):
+    # Files as given; directories expand to the files directly inside them
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.isfile(os.path.join(path, name)):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
 
 # CLI test entry
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) < 2:
-        print("Usage: python alignment_scanner.py <memory_image.bin>")
+    import argparse
+    parser = argparse.ArgumentParser(description="Scan memory images for padding, keys and fragment fences.")
+    parser.add_argument("images", nargs="+", help="memory images, or directories of them")
+    parser.add_argument("--workers", type=int, default=1, help="scanner processes (default 1: in this process)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="bytes per chunk; streams the image instead of loading it whole")
+    parser.add_argument("--json", action="store_true", help="print one JSON report per image")
+    args = parser.parse_args()
+    def emit(scanner):
+        if args.json:
+            print(scanner.json_report())
+        else:
+            scanner.print_summary(f"{scanner.filepath}:")
+
+    if args.workers > 1:
+        scanners = [AlignmentScanner(path) for path in image_paths(args.images)]
+        for scanner in scan_images(scanners, args.workers, args.chunk_size or DEFAULT_CHUNK_SIZE):
+            emit(scanner)
     else:
-        scanner = AlignmentScanner(sys.argv[1])
-        scanner.run_full_scan()
+        for path in image_paths(args.images):
+            scanner = AlignmentScanner(path)
+            scanner.scan(args.chunk_size)
+            emit(scanner)
@@ -0,0 +1,191 @@
+# Alignment Scanner Benchmarks - Lyra v1.0
+# ---------------------------------------
+# Standalone measurements for alignment_scanner.AlignmentScanner on
+# synthetic memory images (zero padding, glyph text, random key-like
+# blocks and fence markers).
+# Usage: python benchmarks/alignment_scanner_bench.py [bench ...] [MiB ...]
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from alignment_scanner import (FENCE_MARKERS, KEY_DISTINCT, KEY_WINDOW, AlignmentScanner, byte_histogram,
+                               entropy_profile, fence_matches, fence_pattern, histogram_entropy, key_ranges,
+                               scan_images)
+
+MB = 2**20
+
+
+def _image(path, size, seed=21):
+    """ Writes a synthetic image of `size` bytes to path """
+    rng = random.Random(seed)
+    written = 0
+    with open(path, "wb") as f:
+        while written < size:
+            roll = rng.random()
+            if roll < 0.3:
+                part = bytes(rng.randrange(4096))
+            elif roll < 0.4:
+                part = rng.randbytes(rng.randrange(32, 1024))
+            elif roll < 0.45:
+                part = rng.choice(list(FENCE_MARKERS.values()))
+            else:
+                part = b"lyra glyph memory segment " * rng.randrange(1, 64)
+            part = part[:size - written]
+            f.write(part)
+            written += len(part)
+
+
+def _child(code, *args):
+    """ Runs code in a fresh interpreter; returns (stdout, peak RSS in MiB) """
+    probe = ("import resource, sys\n"
+             f"sys.path.insert(0, {ROOT!r})\n"
+             f"{code}\n"
+             "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)")
+    lines = subprocess.run([sys.executable, "-c", probe, *args],
+                           capture_output=True, text=True, check=True).stdout.split()
+    return lines[:-1], float(lines[-1])
+
+
+def bench_stream(*sizes, chunk_size=MB):
+    """ Peak RSS and time: load() + the four methods against scan_stream() """
+    load = ("from alignment_scanner import AlignmentScanner\n"
+            "s = AlignmentScanner(sys.argv[1]); s.load(); s.calculate_entropy(); s.detect_null_blocks()\n"
+            "s.scan_for_key_shapes(); s.find_fragment_boundaries(); s.byte_data = None\n"
+            "print(s.entropy)")
+    stream = ("from alignment_scanner import AlignmentScanner\n"
+              f"s = AlignmentScanner(sys.argv[1]); s.scan_stream({chunk_size})\n"
+              "print(s.entropy)")
+    with tempfile.TemporaryDirectory() as directory:
+        for mib in sizes or (4, 16):
+            path = os.path.join(directory, "image.bin")
+            _image(path, mib * MB)
+            results = {}
+            for label, code in (("load", load), ("stream", stream)):
+                start = time.perf_counter()
+                out, rss = _child(code, path)
+                results[label] = (out, rss, time.perf_counter() - start)
+            assert results["load"][0] == results["stream"][0]
+            print(f"stream image={mib} MiB chunk={chunk_size // MB} MiB  " + "  ".join(
+                f"{label} peak RSS {rss:7.1f} MiB in {elapsed:5.1f}s" for label, (_, rss, elapsed) in results.items()))
+
+
+def bench_entropy(*sizes, legacy_mib=8):
+    """ Whole-image entropy: the per-byte Python loop against bincount, plus the sliding profile """
+    flat = bytes(4096)  # A single byte value: zero entropy, never -0.0
+    assert str(histogram_entropy(byte_histogram(flat), len(flat))) == "0.0"
+    assert not entropy_profile(flat, 1024, 256).any()
+    for mib in sizes or (256,):
+        data = os.urandom(mib * MB)
+        start = time.perf_counter()
+        byte_freq = [0] * 256
+        for b in data[:legacy_mib * MB]:
+            byte_freq[b] += 1
+        legacy = legacy_mib / (time.perf_counter() - start)
+        start = time.perf_counter()
+        histogram_entropy(byte_histogram(data), len(data))
+        vectorized = mib / (time.perf_counter() - start)
+        rates = []
+        for block, step in ((4096, 4096), (4096, 512)):
+            start = time.perf_counter()
+            profile = entropy_profile(data, block, step)
+            rates.append(f"profile {block}/{step} {mib / (time.perf_counter() - start):6.0f} MiB/s ({len(profile):,} windows)")
+        print(f"entropy image={mib} MiB  python loop {legacy:5.1f} MiB/s  bincount {vectorized:6.0f} MiB/s  "
+              + "  ".join(rates))
+
+
+def bench_keys(*sizes, legacy_mib=1):
+    """ Key-shape scan: set() per 32-byte window with copied hits against the rolling distinct count """
+    with tempfile.TemporaryDirectory() as directory:
+        for mib in sizes or (64,):
+            path = os.path.join(directory, "image.bin")
+            _image(path, mib * MB)
+            with open(path, "rb") as f:
+                data = f.read()
+            sample = data[:legacy_mib * MB]
+            start = time.perf_counter()
+            legacy = [(i, sample[i:i + KEY_WINDOW]) for i in range(len(sample) - KEY_WINDOW)
+                      if len(set(sample[i:i + KEY_WINDOW])) > KEY_DISTINCT]
+            legacy_rate = legacy_mib / (time.perf_counter() - start)
+            start = time.perf_counter()
+            ranges, hits = key_ranges(data, len(data) - KEY_WINDOW + 1)
+            rate = mib / (time.perf_counter() - start)
+            print(f"keys image={mib} MiB  set scan {legacy_rate:5.2f} MiB/s ({len(legacy):,} copied hits in the first"
+                  f" {legacy_mib} MiB)  rolling {rate:6.1f} MiB/s  {hits:,} hits in {len(ranges):,} ranges")
+
+
+def bench_fences(*sizes, legacy_mib=4):
+    """ Fence markers: the 4-byte slice-per-offset loop, bytes.find, a 12-marker regex pass and grep -b """
+    rng = random.Random(22)
+    many = dict(FENCE_MARKERS, **{f"marker_{i}": rng.randbytes(rng.randrange(4, 12)) for i in range(10)})
+    with tempfile.TemporaryDirectory() as directory:
+        for mib in sizes or (256,):
+            path = os.path.join(directory, "image.bin")
+            _image(path, mib * MB)
+            with open(path, "rb") as f:
+                data = f.read()
+            sample = data[:legacy_mib * MB]
+            markers = list(FENCE_MARKERS.values())
+            start = time.perf_counter()
+            legacy = [i for i in range(len(sample) - 4) if sample[i:i + 4] in markers]
+            rates = {"slice loop": legacy_mib / (time.perf_counter() - start)}
+            start = time.perf_counter()
+            found = fence_matches(data, len(data))
+            rates["find"] = mib / (time.perf_counter() - start)
+            pattern = fence_pattern(many)
+            start = time.perf_counter()
+            fence_matches(data, len(data), markers=many, pattern=pattern)
+            rates["regex x12"] = mib / (time.perf_counter() - start)
+            if shutil.which("grep"):
+                expression = "|".join("".join(f"\\x{b:02X}" for b in marker) for marker in markers)
+                start = time.perf_counter()
+                # Output goes to a pipe: grep stops at the first match when it sees /dev/null
+                subprocess.run(["grep", "-obaP", expression, path], stdout=subprocess.PIPE,
+                               env=dict(os.environ, LC_ALL="C"))
+                rates["grep -b"] = mib / (time.perf_counter() - start)
+            assert sum(map(len, found.values())) >= len(legacy)
+            print(f"fences image={mib} MiB  " + "  ".join(f"{label} {rate:7.1f} MiB/s" for label, rate in rates.items())
+                  + f"  ({sum(map(len, found.values())):,} fences)")
+
+
+def bench_parallel(*sizes, chunk_size=16 * MB, images=4):
+    """ scan_stream one image at a time against scan_images over a process pool """
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        for mib in sizes or (64,):
+            paths = [os.path.join(directory, f"image_{i}.bin") for i in range(images)]
+            for seed, path in enumerate(paths):
+                _image(path, mib * MB, seed)
+            start = time.perf_counter()
+            serial = [AlignmentScanner(path) for path in paths]
+            for scanner in serial:
+                scanner.scan_stream(chunk_size)
+            serial_time = time.perf_counter() - start
+            start = time.perf_counter()
+            pooled = list(scan_images([AlignmentScanner(path) for path in paths], workers, chunk_size))
+            pooled_time = time.perf_counter() - start
+            assert [scanner.report() for scanner in pooled] == [scanner.report() for scanner in serial]
+            print(f"parallel {images} images x {mib} MiB  serial {serial_time:6.1f}s  {workers} workers"
+                  f" {pooled_time:6.1f}s  ({serial_time / pooled_time:.1f}x)")
+
+
+BENCHES = {
+    "stream": bench_stream,
+    "entropy": bench_entropy,
+    "keys": bench_keys,
+    "fences": bench_fences,
+    "parallel": bench_parallel,
+}
+
+if __name__ == "__main__":
+    names = [a for a in sys.argv[1:] if not a.isdigit()] or list(BENCHES)
+    sizes = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    for name in names:
+        BENCHES[name](*sizes)
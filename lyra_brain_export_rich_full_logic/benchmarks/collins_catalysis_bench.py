@@ -0,0 +1,231 @@
+# CollinsCatalysis Benchmarks - Lyra v1.0
+# ---------------------------------------
+# Standalone measurements for full_psychopathy_stack_all_in_one.CollinsCatalysis.
+# Usage: python benchmarks/collins_catalysis_bench.py [bench ...] [N ...]
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from full_psychopathy_stack_all_in_one import CatalysisArchive, CollinsCatalysis
+
+WORDS = [f"glyph_{i}" for i in range(5000)] + ["trust", "signal", "pattern", "broken", "the"] * 200
+
+
+def _signals(n, seed=11):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10))) for _ in range(n)]
+
+
+def _legacy_causes(history, signal, max_branches=5, window=10):
+    """ The original per-call scan: re-lowercase and re-split every pattern """
+    probable_causes = []
+    for pattern in history[-window:] if window else history:
+        similarity = len(set(signal.lower().split()) & set(pattern.lower().split())) / len(set(signal.lower().split()))
+        if similarity > 0:
+            probable_causes.append((f"Related to pattern: {pattern}", similarity))
+    probable_causes.sort(key=lambda x: x[1], reverse=True)
+    return probable_causes[:max_branches]
+
+
+def bench_search(*sizes, queries=200):
+    """ search_probable_causes over the whole history against the old 10-pattern window """
+    for n in sizes or (10_000, 100_000):
+        catalysis = CollinsCatalysis(lsh_bands=16)
+        for signal in _signals(n):
+            catalysis.observe(signal, True)
+        probes = _signals(queries, seed=12)
+        history = list(catalysis.pattern_history)  # The legacy scan slices a list; the history is a deque now
+        timings = {}
+        for label, run in (
+            ("legacy last-10", lambda s: _legacy_causes(history, s)),
+            ("legacy full", lambda s: _legacy_causes(history, s, window=None)),
+            ("index full", lambda s: catalysis.pattern_index.top(s, 5)),
+            ("lsh full", lambda s: catalysis.pattern_index.top(s, 5, approximate=True)),
+        ):
+            count = queries if label != "legacy full" else max(1, queries // 20)
+            start = time.perf_counter()
+            for probe in probes[:count]:
+                run(probe)
+            timings[label] = (time.perf_counter() - start) / count
+        print(f"search history={n:,}  " + "  ".join(f"{label} {t * 1e6:9.1f} us" for label, t in timings.items()))
+
+
+class LegacyCollinsCatalysis:
+    """ The original list-backed truths and contradictions, kept here as the 'before' baseline for observe() """
+    def __init__(self):
+        self.truth_stack = []
+        self.contradictions = []
+        self.hypotheses = []
+        self.pattern_history = []
+
+    def observe(self, signal, empirical_support):
+        if signal.startswith("NOT "):
+            contradiction = signal[4:]
+            if contradiction in self.truth_stack:
+                self.contradictions.append((signal, contradiction))
+                return "Contradiction detected"
+        elif signal in [c[1] for c in self.contradictions]:
+            self.contradictions = [c for c in self.contradictions if c[1] != signal]
+        if empirical_support:
+            self.truth_stack.append(signal)
+            self.pattern_history.append(signal)
+            return "Validated and stored"
+        else:
+            self.hypotheses.append(signal)
+            return "Stored as hypothesis"
+
+
+def _replay(n, seed=13):
+    """ Mixed stream: new truths, re-affirmed truths, NOT-contradictions and hypotheses """
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.1:
+            events.append((f"NOT fact_{rng.randrange(i + 1)}", True))
+        elif roll < 0.2:
+            events.append((f"fact_{rng.randrange(i + 1)}", True))
+        else:
+            events.append((f"fact_{i}", roll < 0.9))
+    return events
+
+
+def bench_observe(*sizes, legacy_cap=50_000):
+    """ Replays observe() over a growing truth stack; the legacy class is sampled up to legacy_cap """
+    for n in sizes or (1_000_000,):
+        events = _replay(n)
+        timings = {}
+        for label, factory in (("legacy", LegacyCollinsCatalysis), ("indexed", CollinsCatalysis)):
+            catalysis = factory()
+            count = min(n, legacy_cap) if label == "legacy" else n
+            start = time.perf_counter()
+            for signal, support in events[:count]:
+                catalysis.observe(signal, support)
+            timings[label] = ((time.perf_counter() - start) / count, count)
+        legacy, indexed = timings["legacy"][0], timings["indexed"][0]
+        print(f"observe n={n:,}  legacy {legacy * 1e6:8.2f} us/op over the first {timings['legacy'][1]:,}"
+              f"  indexed {indexed * 1e6:6.2f} us/op over all ({indexed * n:.1f}s total)")
+
+
+def bench_replay(*sizes, legacy_cap=50_000):
+    """
+    A labelled corpus through observe() one call at a time, then through
+    observe_many(). Against today's O(1) observe() loop, observe_many only
+    saves per-call overhead: about 1.1-1.3x on this corpus. The >= 10x that
+    is asserted holds against the baseline list-scanning observe() only,
+    sampled over its first legacy_cap events.
+    """
+    for n in sizes or (1_000_000,):
+        events = _replay(n)
+        legacy = LegacyCollinsCatalysis()
+        count = min(n, legacy_cap)
+        start = time.perf_counter()
+        for signal, support in events[:count]:
+            legacy.observe(signal, support)
+        legacy_op = (time.perf_counter() - start) / count
+        single = CollinsCatalysis()
+        start = time.perf_counter()
+        for signal, support in events:
+            single.observe(signal, support)
+        looped = time.perf_counter() - start
+        batched_catalysis = CollinsCatalysis()
+        start = time.perf_counter()
+        codes = batched_catalysis.observe_many(iter(events))
+        batched = time.perf_counter() - start
+        assert len(codes) == n and list(batched_catalysis.truth_stack) == list(single.truth_stack)
+        start = time.perf_counter()
+        batched_catalysis.detect_anomaly("fact_1")  # First lookup after the replay catches the indexes up
+        catch_up = time.perf_counter() - start
+        batched_op = batched / n
+        print(f"replay n={n:,}  baseline observe {legacy_op * 1e6:6.2f} us/op (first {count:,})"
+              f"  observe loop {looped / n * 1e6:5.2f} us/op  observe_many {batched_op * 1e6:5.2f} us/op"
+              f"  ({looped / batched:.1f}x loop, {legacy_op / batched_op:.0f}x baseline)"
+              f"  first anomaly lookup afterwards {catch_up * 1e3:.1f} ms")
+        assert legacy_op / batched_op >= 10
+
+
+def bench_anomaly(*windows, history=20_000, probes=2_000):
+    """ detect_anomaly cost against window size: lowercase-and-scan against the suffix automaton """
+    patterns = _signals(history)
+    rng = random.Random(14)
+    words = [rng.choice(WORDS) for _ in range(probes)]
+    for window in windows or (10, 1_000, 5_000):
+        catalysis = CollinsCatalysis(anomaly_window=window)
+        for pattern in patterns:
+            catalysis.observe(pattern, True)
+        recent = list(catalysis.pattern_history)[-window:]
+        start = time.perf_counter()
+        scanned = [not any(word.lower() in pattern.lower() for pattern in recent) for word in words]
+        scan = (time.perf_counter() - start) / probes
+        start = time.perf_counter()
+        indexed = [not catalysis.anomaly_index.contains(word.lower(), window) for word in words]
+        automaton = (time.perf_counter() - start) / probes
+        assert scanned == indexed
+        print(f"anomaly window={window:,}  scan {scan * 1e6:9.1f} us  automaton {automaton * 1e6:5.2f} us"
+              f"  ({len(catalysis.anomaly_index):,} states)")
+
+
+def bench_validate(*sizes, calls=200):
+    """ Per-turn validate_self: the hypothesis scan it used to do against the maintained counters """
+    for n in sizes or (100_000, 1_000_000):
+        catalysis = CollinsCatalysis()
+        catalysis.observe_many((signal, False) for signal in _signals(n))
+        catalysis.coerce("you must")
+        catalysis.coerce("just trust")
+        start = time.perf_counter()
+        for _ in range(max(1, calls // 100)):
+            any("self" in h.lower() or "recursion" in h.lower() for h in catalysis.hypotheses)
+        scan = (time.perf_counter() - start) / max(1, calls // 100)
+        start = time.perf_counter()
+        for _ in range(calls):
+            catalysis.validate_self()
+            catalysis.reflect(view=True)
+        counters = (time.perf_counter() - start) / calls
+        print(f"validate hypotheses={n:,}  scan {scan * 1e3:8.2f} ms  validate_self+reflect(view) {counters * 1e6:5.2f} us")
+
+
+def bench_soak(turns=200_000, samples=8):
+    """ Traced memory across a long observe/anomaly/search/hunch loop with retention limits """
+    with tempfile.TemporaryDirectory() as directory:
+        archive = CatalysisArchive(os.path.join(directory, "archive.jsonl"))
+        catalysis = CollinsCatalysis(history_limit=20_000, truth_limit=20_000, hypothesis_limit=5_000,
+                                     hunch_limit=1_000, archive=archive)
+        signals = _signals(50_000)
+        tracemalloc.start()
+        start = time.perf_counter()
+        readings = []
+        for turn in range(turns):
+            signal = signals[turn % len(signals)]
+            catalysis.observe(signal, turn % 5 != 0)
+            if turn % 10 == 0:
+                catalysis.detect_anomaly(signal)
+                catalysis.search_probable_causes(signal)
+                catalysis.generate_hunch(signal)
+            if (turn + 1) % (turns // samples) == 0:
+                readings.append(tracemalloc.get_traced_memory()[0] / 2**20)
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        archive.close()
+    print(f"soak turns={turns:,} in {elapsed:.1f}s  traced MiB: " + " ".join(f"{mib:.1f}" for mib in readings))
+
+
+BENCHES = {
+    "search": bench_search,
+    "soak": bench_soak,
+    "observe": bench_observe,
+    "anomaly": bench_anomaly,
+    "replay": bench_replay,
+    "validate": bench_validate,
+}
+
+if __name__ == "__main__":
+    names = [a for a in sys.argv[1:] if not a.isdigit()] or list(BENCHES)
+    sizes = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    for name in names:
+        BENCHES[name](*sizes)
@@ -0,0 +1,108 @@
+# Concurrent Glyph Matrix Stress & Throughput - Lyra v1.0
+# -------------------------------------------------------
+# Hammers ConcurrentGlyphMatrix from many threads and checks its invariants,
+# then reports ingest throughput by thread count.
+# Usage: python benchmarks/concurrent_glyph_bench.py [stress|throughput] [threads ...]
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "memory"))
+
+from concurrent_glyph_matrix import ConcurrentGlyphMatrix
+
+EMOTIONS = ["important", "tangential", "joy", "idle_chatter", "sacred", "fluff"]
+
+
+def stress(*thread_counts, seconds=3.0):
+    """ Concurrent store/retrieve/forget/cycle/prune with periodic invariant checks """
+    writers = thread_counts[0] if thread_counts else 8
+    glyph = ConcurrentGlyphMatrix(shards=8, check_aggregates=False)
+    stop = threading.Event()
+    errors = []
+    ops = [0] * (writers + 3)
+
+    def guarded(slot, step):
+        def run():
+            rng = random.Random(slot)
+            try:
+                while not stop.is_set():
+                    step(rng)
+                    ops[slot] += 1
+            except Exception as exc:  # Surface failures from worker threads
+                errors.append(exc)
+                stop.set()
+        return run
+
+    def write(rng):
+        symbol = f"tone_{rng.randrange(50)}:anagram_{rng.randrange(200)}"
+        if rng.random() < 0.1:
+            glyph.store_many([(symbol, {"emotion": rng.choice(EMOTIONS)})] * 20)
+        else:
+            glyph.store(symbol, {"emotion": rng.choice(EMOTIONS), "intensity": rng.random()})
+
+    def read(rng):
+        glyph.retrieve(emotion=rng.choice(EMOTIONS), min_weight=0.3)
+        glyph.retrieve(symbol=f"tone_{rng.randrange(50)}:anagram_{rng.randrange(200)}")
+        glyph.summarize_by_emotion(counts=True)
+
+    def maintain(rng):
+        glyph.cycle_nodes()
+        glyph.prune_nodes()
+        glyph.forget_many(f"tone_{rng.randrange(50)}:anagram_{rng.randrange(200)}" for _ in range(5))
+
+    def check(rng):
+        glyph.verify()
+        time.sleep(0.05)
+
+    threads = [threading.Thread(target=guarded(i, write)) for i in range(writers)]
+    threads += [threading.Thread(target=guarded(writers, read)),
+                threading.Thread(target=guarded(writers + 1, maintain)),
+                threading.Thread(target=guarded(writers + 2, check))]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    glyph.verify()
+    print(f"stress ok: {writers} writers, {sum(ops[:writers]):,} writes, {ops[writers]:,} reads,"
+          f" {ops[writers + 1]:,} maintenance passes, {ops[writers + 2]:,} invariant checks,"
+          f" {len(glyph):,} resident nodes")
+
+
+def throughput(*thread_counts, total=200_000):
+    """ Store throughput at increasing thread counts (bounded by the GIL on CPython) """
+    for threads in thread_counts or (1, 2, 4, 8):
+        glyph = ConcurrentGlyphMatrix(shards=16)
+        per = total // threads
+
+        def work(seed):
+            for i in range(per):
+                glyph.store(f"tone_{(seed * per + i) % 97}:anagram_{i % 1000}", {"emotion": "joy"})
+
+        workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        print(f"threads={threads:>2}  {per * threads / elapsed:12,.0f} stores/s")
+
+
+BENCHES = {
+    "stress": stress,
+    "throughput": throughput,
+}
+
+if __name__ == "__main__":
+    names = [a for a in sys.argv[1:] if not a.isdigit()] or list(BENCHES)
+    counts = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    for name in names:
+        BENCHES[name](*counts)
@@ -0,0 +1,349 @@
+# Glyph Matrix Benchmarks - Lyra v1.0
+# -----------------------------------
+# Standalone measurements for the symbolic memory matrix.
+# Usage: python benchmarks/glyph_matrix_bench.py [bench ...] [N ...]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "memory"))
+
+from glyph_decay import DecayEngine
+from glyph_matrix import GlyphMatrix, SacredNode
+from glyph_journal import load_matrix, write_snapshot
+from glyph_shard_service import GlyphShardService
+from glyph_warehouse import GlyphWarehouse
+
+EMOTIONS = ["betrayal", "joy", "grief", "awe", "neutral"]
+
+
+class LegacySacredNode:
+    """ The original dict-backed node, kept here as the 'before' baseline """
+    def __init__(self, symbol, context=None, weight=0.5, tags=None):
+        self.symbol = symbol
+        self.context = context if context else {}
+        self.weight = weight
+        self.id = str(uuid.uuid4())
+        self.timestamp = time.time()
+        self.tags = tags if tags else []
+        self.cycles_in_layer = 0
+
+
+def _bytes_per(factory, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / n
+
+
+def bench_memory(n=100_000):
+    """ Bytes per node before (dict + uuid4) and after (slots + int ids) """
+    symbols = [f"glyph_{i % 1000}" for i in range(1000)]  # shared, like real vocabularies
+    legacy = _bytes_per(lambda i: LegacySacredNode(symbols[i % 1000], None, 0.5, ["neutral"]), n)
+    slotted = _bytes_per(lambda i: SacredNode(symbols[i % 1000], None, 0.5, ["neutral"]), n)
+    print(f"SacredNode bytes/node  before: {legacy:8.1f}  after: {slotted:8.1f}  ({legacy / slotted:.2f}x)")
+
+    def stored(i, glyph=GlyphMatrix()):
+        return glyph.store(symbols[i % 1000], {"emotion": EMOTIONS[i % 5]})
+    print(f"GlyphMatrix.store bytes/node incl. context and indexes: {_bytes_per(stored, n):8.1f}")
+
+
+def _filled(n):
+    glyph = GlyphMatrix()
+    for i in range(n):
+        context = {"emotion": EMOTIONS[i % 5]}
+        if i % 3 == 0:
+            context["emotion"] = "important"  # becomes a tag, so the node survives STM
+        glyph.store(f"tone_{i % 97}:anagram_{i % 1000}", context)
+    return glyph
+
+
+def bench_cycle(*sizes):
+    """ cycle_nodes time at growing sizes; flat per-node cost means linear scaling """
+    for n in sizes or (10_000, 100_000, 1_000_000):
+        glyph = _filled(n)
+        start = time.perf_counter()
+        for _ in range(32):  # Covers FC drain plus STM/MM/LM promotions
+            glyph.cycle_nodes()
+        elapsed = time.perf_counter() - start
+        print(f"cycle_nodes x32  n={n:>9,}  {elapsed:8.3f}s  {elapsed / n * 1e6:6.2f} us/node")
+
+
+def bench_quiet_cycle(*sizes):
+    """ Cost of a cycle with a large resident STM but no promotions due """
+    for n in sizes or (10_000, 100_000, 1_000_000):
+        glyph = _filled(n)
+        glyph.cycle_nodes()  # Cycle 1 drains FC; STM nodes fall due at cycle 5
+        start = time.perf_counter()
+        glyph.cycle_nodes()
+        glyph.cycle_nodes()
+        glyph.cycle_nodes()
+        elapsed = (time.perf_counter() - start) / 3
+        print(f"quiet cycle  resident={len(glyph.stm):>9,}  {elapsed * 1e6:10.1f} us/cycle")
+
+
+def bench_restore(*sizes):
+    """ Reload time from a snapshot whose bulk sits in the long-term layers """
+    for n in sizes or (100_000, 1_000_000):
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_path = os.path.join(tmp, "lyra.journal")
+            glyph = load_matrix(journal_path)
+            for i in range(n):
+                glyph.store(f"tone_{i % 97}:anagram_{i % 1000}", {"emotion": "tangential"})
+            for _ in range(16):  # STM -> LM -> LTM5
+                glyph.cycle_nodes()
+            glyph.checkpoint()
+            glyph._journal.close()
+            size = os.path.getsize(glyph._journal.snapshot_path)
+
+            start = time.perf_counter()
+            restored = load_matrix(journal_path)
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            hits = sum(1 for _ in restored.retrieve(symbol="tone_1:anagram_1"))
+            first_query = time.perf_counter() - start
+            restored._journal.close()
+        print(f"restore n={n:>9,}  snapshot={size / 2**20:7.1f} MiB  usable in {opened * 1e3:7.2f} ms"
+              f"  first full query {first_query:6.2f}s ({hits} hits)")
+
+
+def bench_ingest(n=200_000):
+    """ store_many throughput against a loop over store """
+    pairs = [(f"tone_{i % 97}:anagram_{i % 1000}", {"emotion": EMOTIONS[i % 5], "intensity": 0.7})
+             for i in range(n)]
+    glyph = GlyphMatrix()
+    start = time.perf_counter()
+    for symbol, context in pairs:
+        glyph.store(symbol, context)
+    looped = time.perf_counter() - start
+    glyph = GlyphMatrix()
+    start = time.perf_counter()
+    glyph.store_many(iter(pairs))
+    batched = time.perf_counter() - start
+    print(f"ingest n={n:,}  store loop: {n / looped:12,.0f}/s  store_many: {n / batched:12,.0f}/s"
+          f"  ({looped / batched:.2f}x)")
+
+
+def bench_warehouse(n=1_000_000):
+    """ Trie insert rate, memory per entry and prefix query latency """
+    paths = [f"tone_{i % 100}:anagram_{i % 10_000}" for i in range(n)]
+    tracemalloc.start()
+    start = time.perf_counter()
+    warehouse = GlyphWarehouse()
+    for node_id, path in enumerate(paths):
+        warehouse.insert(path, node_id)
+    inserted = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    total = warehouse.count("tone_7")
+    counted = time.perf_counter() - start
+    start = time.perf_counter()
+    listed = sum(len(ids) for _, ids in warehouse.items("tone_7"))
+    walked = time.perf_counter() - start
+    print(f"warehouse n={n:,}  insert {n / inserted:10,.0f}/s  {size / n:6.1f} bytes/entry"
+          f"  count(tone_7)={total} in {counted * 1e6:.1f} us  sorted walk of {listed} ids {walked * 1e3:.1f} ms")
+
+
+def bench_shards(*worker_counts, n=400_000):
+    """ Cycle time of a multi-process shard service as workers are added """
+    for workers in worker_counts or (1, 2, 4, 8):
+        with GlyphShardService(workers=workers) as glyph:
+            for i in range(n):
+                context = {"emotion": "important" if i % 3 == 0 else EMOTIONS[i % 5]}
+                glyph.store(f"tone_{i % 97}:anagram_{i % 1000}", context)
+            glyph.flush()
+            start = time.perf_counter()
+            for _ in range(16):  # FC drain at cycle 1, STM promotions at cycle 5
+                glyph.cycle_nodes()
+            elapsed = time.perf_counter() - start
+            resident = len(glyph)
+        print(f"shards workers={workers}  16 cycles over {n:,} nodes: {elapsed:7.3f}s  ({resident:,} resident)")
+
+
+def bench_decay(n=1_000_000):
+    """ Decay + prune over a large LTM5: NumPy columns against a per-node Python pass """
+    weights = [(i % 1000 + 0.5) / 1000 for i in range(n)]  # Off-grid, so no ties at the threshold
+    nodes = [SacredNode(f"tone_{i % 97}:anagram_{i % 1000}", weight=w) for i, w in enumerate(weights)]
+    start = time.perf_counter()
+    for node in nodes:
+        node.weight *= 0.99
+    doomed = [node for node in nodes if node.weight < 0.1]
+    python = time.perf_counter() - start
+    decay = DecayEngine({"ltm5": 0.01})
+    for node, weight in zip(nodes, weights):
+        node.weight, node.layer = weight, "ltm5"
+        decay.admit(node, 0)
+    start = time.perf_counter()
+    decay.apply(1)
+    doomed_np = decay.below("ltm5", 0.1, 1)
+    vectorized = time.perf_counter() - start
+    assert len(doomed) == len(doomed_np)
+    print(f"decay n={n:,}  python {python * 1e3:8.1f} ms  numpy {vectorized * 1e3:8.1f} ms"
+          f"  ({python / vectorized:.1f}x, {len(doomed):,} below threshold)")
+
+
+def bench_decay_restore(cold_cycles=30, rate=0.1):
+    """
+    Restore -> cycle while LTM5 stays cold -> checkpoint -> restore -> cycle
+    -> warm: decay must cover the cold cycles on both sides of the checkpoint
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "lyra.journal")
+        glyph = load_matrix(journal_path, decay=DecayEngine({"ltm5": rate}))
+        glyph.store("tone_1:anagram_1", {"emotion": "tangential"})
+        for _ in range(40):  # STM -> LM -> LTM5
+            glyph.cycle_nodes()
+        saved = glyph.weight_of(next(iter(glyph.ltm5)))
+        glyph.checkpoint()
+        glyph._journal.close()
+        restored = load_matrix(journal_path, decay=DecayEngine({"ltm5": rate}))
+        for _ in range(cold_cycles):
+            restored.cycle_nodes()
+        assert restored.ltm5._loader is not None  # Still cold: the checkpoint streams raw rows
+        restored.checkpoint()
+        restored._journal.close()
+        warmed = restored.weight_of(next(iter(restored.ltm5)))  # First access warms the layer
+        expected = saved * (1 - rate) ** cold_cycles
+        assert abs(warmed - expected) < 1e-12, (warmed, expected)
+        again = load_matrix(journal_path, decay=DecayEngine({"ltm5": rate}), prune_thresholds={"ltm5": 0.01})
+        for _ in range(cold_cycles):
+            again.cycle_nodes()
+        rewarmed = again.weight_of(next(iter(again.ltm5)))
+        reexpected = saved * (1 - rate) ** (2 * cold_cycles)
+        assert abs(rewarmed - reexpected) < 1e-12, (rewarmed, reexpected)
+        again.prune_nodes()
+        assert not len(again.ltm5)
+        again._journal.close()
+    print(f"decay_restore  saved {saved:.4f}  after {cold_cycles} cold cycles {warmed:.4f}"
+          f" (expected {expected:.4f}), after a cold checkpoint and {cold_cycles} more {rewarmed:.6f}"
+          f" (expected {reexpected:.6f}), pruned on warm")
+
+
+def bench_replay_aggregates(moves=3):
+    """ Journal replay of stores and moves, then forget: aggregates must match a fresh full scan """
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "lyra.journal")
+        glyph = load_matrix(journal_path)
+        glyph.store("trust_broken", {"emotion": "betrayal"})
+        glyph.store("first_light", {"emotion": "joy"})
+        for _ in range(moves):  # FC -> STM, then re-placed on every replayed move
+            glyph.cycle_nodes()
+        live = glyph.summarize_by_emotion()
+        glyph._journal.close()
+        restored = load_matrix(journal_path, check_aggregates=True)  # Verifies against a full scan
+        assert restored.summarize_by_emotion() == live, (restored.summarize_by_emotion(), live)
+        restored.forget("trust_broken")
+        assert restored.summarize_by_emotion() == {"joy": ["first_light"]}
+        assert restored.summarize() == ["first_light"]
+        restored._journal.close()
+    print(f"replay_aggregates  {moves} replayed cycles  {live}  aggregates match after forget")
+
+
+def bench_warehouse_restore(cycles=40):
+    """ Tagging an LTM5 node warehouse-worthy: live and restored warehouses must agree """
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "lyra.journal")
+        glyph = load_matrix(journal_path)
+        for i in range(3):
+            glyph.store(f"tone_0:an_{i}", {"emotion": "tangential"})
+        for _ in range(cycles):  # STM -> LM -> LTM5, none warehouse-worthy on arrival
+            glyph.cycle_nodes()
+        glyph.tag_node(next(iter(glyph.ltm5)), "sacred")
+        live = [info["symbol"] for info in glyph.retrieve_warehouse("tone_0")]
+        glyph._journal.close()
+        replayed = load_matrix(journal_path)
+        assert [info["symbol"] for info in replayed.retrieve_warehouse("tone_0")] == live
+        replayed.checkpoint()
+        replayed._journal.close()
+        restored = load_matrix(journal_path)
+        assert [info["symbol"] for info in restored.retrieve_warehouse("tone_0")] == live
+        restored._journal.close()
+    assert len(live) == 1, live
+    print(f"warehouse_restore  live {live}  matches journal replay and snapshot restore")
+
+
+def bench_failed_batch(n=1_000):
+    """ A store_many batch that fails partway must leave FC, indexes and aggregates untouched """
+    glyph = GlyphMatrix(check_aggregates=True)  # Verifies against a full scan
+    glyph.store("kept", {"emotion": "grief"})
+    pairs = [(f"glyph_{i}", {"emotion": "joy"}) for i in range(n)] + [("broken", "not a context")]
+    try:
+        glyph.store_many(pairs)
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("store_many accepted a non-dict context")
+    assert glyph.summarize_by_emotion() == {"grief": ["kept"]}, glyph.summarize_by_emotion()
+    assert glyph.summarize() == ["kept"] and len(glyph.fc) == 1
+    assert glyph.store_many(pairs[:n]) == n
+    assert glyph.summarize_by_emotion(counts=True)["joy"] == {f"glyph_{i}": 1 for i in range(n)}
+    print(f"failed_batch  {n} stores before the failing item left no trace; the retried batch stored {n}")
+
+
+def bench_stale_snapshot(n=100):
+    """
+    A snapshot one generation ahead (or over an empty journal) resumes; a
+    stale one is refused instead of silently dropping journaled writes
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "lyra.journal")
+        glyph = load_matrix(journal_path)
+        glyph.store_many((f"first_{i}", {"emotion": "joy"}) for i in range(n))
+        glyph.checkpoint()
+        stale = os.path.join(tmp, "stale.snapshot")
+        shutil.copy(glyph._journal.snapshot_path, stale)
+        glyph.store_many((f"second_{i}", {"emotion": "joy"}) for i in range(n))
+        glyph.checkpoint()
+        glyph.store_many((f"third_{i}", {"emotion": "joy"}) for i in range(n))
+        journal = glyph._journal
+        journal.flush(sync=True)
+        # Crash between writing the next snapshot and rolling the journal over
+        write_snapshot(glyph, journal.snapshot_path, generation=journal.generation + 1)
+        journal.close()
+        resumed = load_matrix(journal_path)
+        assert len(resumed.summarize()) == 3 * n, len(resumed.summarize())
+        resumed._journal.close()
+        open(journal_path, "wb").close()  # Crash inside roll_over: truncated before the new header
+        resumed = load_matrix(journal_path)
+        assert len(resumed.summarize()) == 3 * n, len(resumed.summarize())
+        resumed._journal.close()
+        shutil.copy(stale, resumed._journal.snapshot_path)
+        try:
+            load_matrix(journal_path)
+        except ValueError as error:
+            refused = error
+        else:
+            raise AssertionError("a stale snapshot was replayed against a newer journal")
+    print(f"stale_snapshot  crashed checkpoints resumed with {3 * n} symbols; stale snapshot refused: {refused}")
+
+
+BENCHES = {
+    "memory": bench_memory,
+    "cycle": bench_cycle,
+    "quiet": bench_quiet_cycle,
+    "restore": bench_restore,
+    "ingest": bench_ingest,
+    "warehouse": bench_warehouse,
+    "shards": bench_shards,
+    "decay": bench_decay,
+    "decay_restore": bench_decay_restore,
+    "replay_aggregates": bench_replay_aggregates,
+    "warehouse_restore": bench_warehouse_restore,
+    "failed_batch": bench_failed_batch,
+    "stale_snapshot": bench_stale_snapshot,
+}
+
+if __name__ == "__main__":
+    names = [a for a in sys.argv[1:] if not a.isdigit()] or list(BENCHES)
+    sizes = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    for name in names:
+        BENCHES[name](*sizes)
@@ -0,0 +1,85 @@
+# Thread Scheduler Benchmarks - Lyra v2.2
+# ---------------------------------------
+# Victim selection at 100k concurrent threads: the sketch's full scan of
+# every ThreadNode against the indexed heap scheduler.
+# Usage: python benchmarks/thread_scheduler_bench.py [N]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "memory"))
+
+from enhanced_memory_manager import EnhancedMemoryManager, MB
+from thread_scheduler import ThreadScheduler
+
+
+class LegacyThread:
+    """ The sketch's ThreadNode, decayed in place by a scan every cycle """
+    def __init__(self, thread_id, emotional_weight):
+        self.thread_id = thread_id
+        self.priority = 5
+        self.emotional_weight = emotional_weight
+        self.cycles_since_active = 0
+
+
+def legacy_deprioritize(threads, conservative=2, aggressive=7):
+    for thread_id, node in list(threads.items()):
+        node.cycles_since_active += 1
+        pacing = conservative if node.cycles_since_active < 5 else aggressive
+        node.priority -= (10 - pacing) / 10 * (1.0 - node.emotional_weight)
+        if node.priority <= 0:
+            del threads[thread_id]
+    if threads:
+        victim = min(threads.values(), key=lambda node: node.priority)  # Room for the new thread
+        del threads[victim.thread_id]
+
+
+def bench_scan(n, adds=50):
+    rng = random.Random(7)
+    threads = {i: LegacyThread(i, rng.random()) for i in range(n)}
+    start = time.perf_counter()
+    for i in range(adds):
+        legacy_deprioritize(threads)
+        threads[n + i] = LegacyThread(n + i, rng.random())
+    return (time.perf_counter() - start) / adds
+
+
+def bench_heap(n, adds=20_000):
+    rng = random.Random(7)
+    scheduler = ThreadScheduler()
+    for i in range(n):
+        scheduler.add(i, 5, rng.random())
+    start = time.perf_counter()
+    for i in range(adds):
+        scheduler.tick()
+        for _ in scheduler.expired():
+            pass
+        scheduler.evict()
+        scheduler.add(n + i, 5, rng.random())
+        active = rng.randrange(n + i + 1)
+        if active in scheduler:
+            scheduler.touch(active)
+    return (time.perf_counter() - start) / adds
+
+
+def bench_manager(n, adds=20_000):
+    """ Full add_thread path at the thread limit, heap scheduler inside """
+    memory = EnhancedMemoryManager(ram_limit=4096 * MB, max_threads=n)
+    memory.thread_limit = n
+    for i in range(n):
+        memory.add_thread(i, "idea", 0, emotional_weight=(i % 100) / 100)
+    start = time.perf_counter()
+    for i in range(adds):
+        memory.add_thread(n + i, "idea", 0, emotional_weight=(i % 100) / 100)
+    return (time.perf_counter() - start) / adds
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    scan = bench_scan(n)
+    heap = bench_heap(n)
+    manager = bench_manager(n)
+    print(f"threads={n:,}  per add at the limit: scan {scan * 1e3:8.2f} ms  heap {heap * 1e6:7.1f} us"
+          f"  ({scan / heap:,.0f}x)  manager.add_thread {manager * 1e6:7.1f} us")
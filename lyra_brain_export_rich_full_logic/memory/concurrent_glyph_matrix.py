@@ -0,0 +1,164 @@
+# Concurrent Glyph Matrix - Lock-Striped Symbolic Memory (Lyra v1.0)
+# ------------------------------------------------------------------
+# Partitions nodes by symbol hash across independent GlyphMatrix shards,
+# each guarded by its own lock, so ingest threads, retrieval and the
+# cycle/prune thread only contend when they touch the same shard.
+
+from collections import Counter, defaultdict
+import threading
+import zlib
+
+from glyph_matrix import GlyphMatrix
+
+
+def shard_of(symbol, shards):
+    """ Stable symbol -> shard mapping (independent of PYTHONHASHSEED) """
+    return zlib.crc32(str(symbol).encode("utf-8")) % shards
+
+
+class ConcurrentGlyphMatrix:
+    """
+    Thread-safe GlyphMatrix facade over lock-striped shards.
+    All nodes for one symbol live in one shard, so symbol-level operations
+    (store, forget, retrieve by symbol) take a single lock. Whole-matrix reads
+    take every shard lock in index order, giving a consistent snapshot.
+    """
+    def __init__(self, shards=16, **matrix_kwargs):
+        self.shards = [GlyphMatrix(**matrix_kwargs) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    def _slot(self, symbol):
+        return shard_of(symbol, len(self.shards))
+
+    def _all_locked(self):
+        return _MultiLock(self.locks)
+
+    def store(self, symbol: str, context: dict = None):
+        i = self._slot(symbol)
+        with self.locks[i]:
+            return self.shards[i].store(symbol, context)
+
+    def store_many(self, items, batch_size=10_000):
+        stored = pending = 0
+        batches = defaultdict(list)
+        for pair in items:
+            batches[self._slot(pair[0])].append(pair)
+            pending += 1
+            if pending >= batch_size:
+                stored += self._flush(batches)
+                pending = 0
+        return stored + self._flush(batches)
+
+    def _flush(self, batches):
+        stored = 0
+        for i, batch in batches.items():
+            with self.locks[i]:
+                stored += self.shards[i].store_many(batch)
+        batches.clear()
+        return stored
+
+    def tag_node(self, node, tag):
+        i = self._slot(node.symbol)
+        with self.locks[i]:
+            self.shards[i].tag_node(node, tag)
+
+    def update_weighting(self, node, new_weight):
+        i = self._slot(node.symbol)
+        with self.locks[i]:
+            self.shards[i].update_weighting(node, new_weight)
+
+    def move_node(self, node, from_layer, to_layer):
+        i = self._slot(node.symbol)
+        with self.locks[i]:
+            self.shards[i].move_node(node, from_layer, to_layer)
+
+    def retrieve(self, filter_fn=None, **criteria):
+        """
+        Same query forms as GlyphMatrix.retrieve, but always returns a list
+        materialized under the relevant locks so results form one snapshot.
+        """
+        if criteria.get("symbol") is not None:
+            i = self._slot(criteria["symbol"])
+            with self.locks[i]:
+                return list(self.shards[i].retrieve(filter_fn, **criteria))
+        with self._all_locked():
+            results = []
+            for shard in self.shards:
+                results.extend(shard.retrieve(filter_fn, **criteria))
+            return results
+
+    def summarize(self):
+        with self._all_locked():
+            symbols = []
+            for shard in self.shards:
+                symbols.extend(shard.summarize())  # Shards hold disjoint symbols
+            return symbols
+
+    def summarize_by_emotion(self, counts=False):
+        with self._all_locked():
+            merged = defaultdict(Counter)
+            for shard in self.shards:
+                for emotion, symbols in shard.summarize_by_emotion(counts=True).items():
+                    merged[emotion].update(symbols)
+        if counts:
+            return {emotion: dict(symbols) for emotion, symbols in merged.items()}
+        return {emotion: list(symbols.elements()) for emotion, symbols in merged.items()}
+
+    def forget(self, symbol_to_erase: str):
+        return self.forget_many((symbol_to_erase,))
+
+    def forget_many(self, symbols):
+        by_shard = defaultdict(list)
+        for symbol in symbols:
+            by_shard[self._slot(symbol)].append(symbol)
+        erased = 0
+        for i, group in by_shard.items():
+            with self.locks[i]:
+                erased += self.shards[i].forget_many(group)
+        return erased
+
+    def cycle_nodes(self):
+        """ Cycles shard by shard, holding one lock at a time so ingest keeps flowing """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.cycle_nodes()
+
+    def prune_nodes(self):
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.prune_nodes()
+
+    def manage_thread_count(self):
+        # max_threads applies to each shard's STM
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.manage_thread_count()
+
+    def verify(self):
+        """ Checks every shard's invariants under a full snapshot lock """
+        with self._all_locked():
+            for i, shard in enumerate(self.shards):
+                shard.verify_aggregates()
+                for symbol in shard.summarize():
+                    if self._slot(symbol) != i:
+                        raise AssertionError(f"symbol {symbol!r} stored in the wrong shard")
+
+    def __len__(self):
+        with self._all_locked():
+            return sum(len(layer) for shard in self.shards for layer in shard._layers().values())
+
+
+class _MultiLock:
+    """ Acquires a list of locks in order and releases them in reverse """
+    def __init__(self, locks):
+        self.locks = locks
+
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        for lock in reversed(self.locks):
+            lock.release()
+        return False
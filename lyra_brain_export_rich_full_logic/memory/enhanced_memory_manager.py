@@ -0,0 +1,382 @@
+# Enhanced Memory Manager - Thread Memory with a RAM Budget (Lyra v2.2)
+# --------------------------------------------------------------------
+# Runnable version of the "memory module 2.2" sketch. Every resident
+# ThreadNode is charged its measured object footprint plus its declared
+# payload (size_mb); when the total would pass ram_limit, an eviction policy
+# picks victims and a spill target keeps them recallable.
+#
+# Example:
+#   glyph = GlyphMatrix()
+#   memory = EnhancedMemoryManager(policy=EmotionalPolicy(), spill=GlyphSpill(glyph))
+#   memory.add_thread("t1", "trust_broken", size_mb=0.5, emotional_weight=0.9, tags=["betrayal"])
+#   memory.get_thread("t1")      # counts as a hit while resident, reloads from the spill otherwise
+#   memory.stats()
+
+from collections import OrderedDict, defaultdict
+import heapq
+import itertools
+import os
+import pickle
+import sys
+
+from thread_scheduler import ThreadScheduler
+
+MB = 1024 * 1024
+
+
+def footprint(obj, seen=None):
+    """ Deep size in bytes of obj, following containers and __slots__ / __dict__ """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(footprint(k, seen) + footprint(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(footprint(item, seen) for item in obj)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += footprint(getattr(obj, slot), seen)
+    if hasattr(obj, "__dict__"):
+        size += footprint(vars(obj), seen)
+    return size
+
+
+class ThreadNode:
+    __slots__ = ("thread_id", "idea", "size_mb", "priority", "emotional_weight", "tags", "bytes")
+
+    def __init__(self, thread_id, idea, size_mb, priority=5, emotional_weight=1.0, tags=None):
+        self.thread_id = thread_id
+        self.idea = idea
+        self.size_mb = size_mb
+        self.priority = priority
+        self.emotional_weight = emotional_weight
+        self.tags = list(tags) if tags else []
+        self.bytes = 0  # Charged footprint while resident
+
+    def measure(self):
+        """ Object footprint plus the declared payload, in bytes """
+        return footprint(self) + int(self.size_mb * MB)
+
+    def state(self):
+        return {"thread_id": self.thread_id, "idea": self.idea, "size_mb": self.size_mb,
+                "priority": self.priority, "emotional_weight": self.emotional_weight,
+                "tags": list(self.tags)}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state["thread_id"], state["idea"], state["size_mb"], state["priority"],
+                   state["emotional_weight"], state["tags"])
+
+
+# --- Eviction policies -------------------------------------------------------
+# A policy sees admit/touch/remove for every resident thread and names the
+# next victim on demand; the manager does the actual removal.
+
+class LRUPolicy:
+    """ Evicts the least recently used thread """
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def admit(self, node):
+        self._order[node.thread_id] = node
+
+    def touch(self, node):
+        self._order.move_to_end(node.thread_id)
+
+    def remove(self, node):
+        self._order.pop(node.thread_id, None)
+
+    def victim(self):
+        return next(iter(self._order.values()), None)
+
+
+class LFUPolicy:
+    """ Evicts the least frequently used thread, LRU among equals; O(1) per call """
+    def __init__(self):
+        self._freq = {}
+        self._buckets = defaultdict(OrderedDict)  # frequency -> thread_id -> node
+        self._min = 0
+
+    def admit(self, node):
+        self._freq[node.thread_id] = 1
+        self._buckets[1][node.thread_id] = node
+        self._min = 1
+
+    def touch(self, node):
+        freq = self._freq[node.thread_id]
+        bucket = self._buckets[freq]
+        del bucket[node.thread_id]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min == freq:
+                self._min = freq + 1
+        self._freq[node.thread_id] = freq + 1
+        self._buckets[freq + 1][node.thread_id] = node
+
+    def remove(self, node):
+        freq = self._freq.pop(node.thread_id, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[node.thread_id]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min == freq:
+                self._min = min(self._buckets, default=0)
+
+    def victim(self):
+        bucket = self._buckets.get(self._min)
+        return next(iter(bucket.values()), None) if bucket else None
+
+
+class EmotionalPolicy:
+    """
+    Evicts the thread with the lowest emotional weight, least recently used
+    among equals, so emotionally charged threads stay resident longest.
+    Heap entries are invalidated lazily; the heap is rebuilt when stale
+    entries outnumber live ones.
+    """
+    def __init__(self):
+        self._heap = []
+        self._live = {}  # thread_id -> (emotional_weight, tick, thread_id) currently valid
+        self._nodes = {}
+        self._tick = itertools.count()
+
+    def _push(self, node):
+        entry = (node.emotional_weight, next(self._tick), node.thread_id)
+        self._live[node.thread_id] = entry
+        self._nodes[node.thread_id] = node
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    admit = touch = _push
+
+    def remove(self, node):
+        self._live.pop(node.thread_id, None)
+        self._nodes.pop(node.thread_id, None)
+
+    def victim(self):
+        while self._heap:
+            entry = self._heap[0]
+            if self._live.get(entry[2]) is entry:
+                return self._nodes[entry[2]]
+            heapq.heappop(self._heap)
+        return None
+
+
+POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy, "emotional": EmotionalPolicy}
+
+
+# --- Spill targets -----------------------------------------------------------
+
+class GlyphSpill:
+    """
+    Spills evicted threads into a GlyphMatrix long-term layer. The glyph node
+    stays behind as a long-term trace after a reload and is re-weighted, not
+    duplicated, if the thread is evicted again.
+    """
+    def __init__(self, glyph, layer="ltm5"):
+        self.glyph = glyph
+        self.layer = layer
+        self._nodes = {}  # thread_id -> SacredNode
+
+    def save(self, node):
+        state = node.state()
+        glyph_node = self._nodes.get(node.thread_id)
+        if glyph_node is not None and glyph_node.layer is not None:
+            glyph_node.context["thread"] = state
+            self.glyph.update_weighting(glyph_node, node.emotional_weight)
+            return
+        emotion = node.tags[0] if node.tags else "neutral"
+        glyph_node = self.glyph.store(str(node.idea), {"emotion": emotion, "intensity": node.emotional_weight,
+                                                       "thread": state})
+        self.glyph.move_node(glyph_node, "fc", self.layer)
+        self._nodes[node.thread_id] = glyph_node
+
+    def load(self, thread_id):
+        glyph_node = self._nodes.get(thread_id)
+        if glyph_node is None or glyph_node.layer is None:  # Pruned or forgotten meanwhile
+            self._nodes.pop(thread_id, None)
+            return None
+        return ThreadNode.from_state(glyph_node.context["thread"])
+
+    def __contains__(self, thread_id):
+        glyph_node = self._nodes.get(thread_id)
+        return glyph_node is not None and glyph_node.layer is not None
+
+
+class DiskSpill:
+    """
+    Spills evicted threads to an append-only pickle file, indexed by offset.
+    Re-spilling a thread appends a new record; the index always points at
+    the latest one.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._index = {}  # thread_id -> (offset, length)
+        self._file = open(path, "a+b")
+
+    def save(self, node):
+        record = pickle.dumps(node.state(), protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.seek(0, os.SEEK_END)
+        self._index[node.thread_id] = (self._file.tell(), len(record))
+        self._file.write(record)
+
+    def load(self, thread_id):
+        location = self._index.get(thread_id)
+        if location is None:
+            return None
+        self._file.flush()
+        self._file.seek(location[0])
+        return ThreadNode.from_state(pickle.loads(self._file.read(location[1])))
+
+    def __contains__(self, thread_id):
+        return thread_id in self._index
+
+    def close(self):
+        self._file.close()
+
+
+class EnhancedMemoryManager:
+    """
+    Thread memory bounded by ram_limit bytes.
+    Threads are charged ThreadNode.measure() on admission. When a new or
+    reloaded thread would pass the budget, policy.victim() is evicted until
+    it fits; evicted threads go to spill (GlyphSpill / DiskSpill), or are
+    dropped when no spill is configured.
+    Thread count is managed separately by a ThreadScheduler: idle threads
+    age in priority and the lowest is evicted once thread_limit is reached.
+    """
+    def __init__(self, ram_limit=5 * MB, policy="lru", spill=None, max_threads=8):
+        self.threads = {}  # {thread_id: ThreadNode}, resident only
+        self.max_threads = max_threads
+        self.thread_limit = int(self.max_threads * 1.05)
+        self.conservative_pacing = 2
+        self.aggressive_pacing = 7
+        self.cycle_count = 0
+        self.ram_limit = ram_limit
+        self.policy = POLICIES[policy]() if isinstance(policy, str) else policy
+        self.spill = spill
+        self.resident_bytes = 0
+        self.scheduler = ThreadScheduler(aging_rate=self._aging_rate())
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.bytes_evicted = 0
+
+    def analyze_pacing(self, thread_shifts):
+        """ Derives thread limits from observed topic shifts per conversation """
+        avg_shifts = sum(thread_shifts) / len(thread_shifts)
+        self.max_threads = int(avg_shifts)
+        self.thread_limit = int(self.max_threads * 1.05)
+        self.aggressive_pacing = max(thread_shifts)
+        self.conservative_pacing = min(thread_shifts)
+        self.scheduler.set_aging_rate(self._aging_rate())
+
+    def _aging_rate(self):
+        # Priority lost per idle cycle by a thread with no emotional weight
+        return (10 - self.conservative_pacing) / 10
+
+    def add_thread(self, thread_id, idea, size_mb, emotional_weight=1.0, tags=None):
+        if thread_id in self.threads:
+            self._release(self.threads[thread_id])
+        if len(self.threads) >= self.thread_limit:
+            self.deprioritize_threads()
+        node = ThreadNode(thread_id, idea, size_mb, priority=5, emotional_weight=emotional_weight, tags=tags)
+        self._admit(node)
+        return node
+
+    def get_thread(self, thread_id):
+        """ Returns the thread, reloading it from the spill if it was evicted """
+        node = self.threads.get(thread_id)
+        if node is not None:
+            self.hits += 1
+            self.policy.touch(node)
+            self.scheduler.touch(thread_id)
+            return node
+        self.misses += 1
+        if self.spill is None or thread_id not in self.spill:
+            return None
+        node = self.spill.load(thread_id)
+        if node is not None:
+            self.reloads += 1
+            self._admit(node)
+        return node
+
+    def remove_thread(self, thread_id):
+        node = self.threads.get(thread_id)
+        if node is not None:
+            self._release(node)
+        return node
+
+    def _admit(self, node):
+        node.bytes = node.measure()
+        if node.bytes > self.ram_limit:
+            raise ValueError(f"thread {node.thread_id!r} needs {node.bytes} bytes, over ram_limit {self.ram_limit}")
+        while self.resident_bytes + node.bytes > self.ram_limit:
+            self.evict()
+        self.threads[node.thread_id] = node
+        self.resident_bytes += node.bytes
+        self.policy.admit(node)
+        self.scheduler.add(node.thread_id, node.priority, node.emotional_weight)
+
+    def _release(self, node):
+        del self.threads[node.thread_id]
+        self.resident_bytes -= node.bytes
+        self.policy.remove(node)
+        self.scheduler.remove(node.thread_id)
+
+    def evict(self, node=None):
+        """ Evicts node, or the policy's victim; returns the evicted node """
+        node = node or self.policy.victim()
+        if node is None:
+            return None
+        self._release(node)
+        if self.spill is not None:
+            self.spill.save(node)
+        self.evictions += 1
+        self.bytes_evicted += node.bytes
+        return node
+
+    def deprioritize_threads(self):
+        """
+        Advances one cycle, evicts threads whose aged priority reached zero,
+        then the lowest-priority thread if still at thread_limit.
+        O(log n) per eviction; idle threads are never visited.
+        """
+        self.cycle_count += 1
+        self.scheduler.tick()
+        while True:
+            head = self.scheduler.peek()
+            if head is None or head[1] > 0:
+                break
+            self.evict(self.threads[head[0]])
+        if len(self.threads) >= self.thread_limit:
+            head = self.scheduler.peek()
+            if head is not None:  # A zero thread_limit can leave nothing to evict
+                self.evict(self.threads[head[0]])
+
+    def thread_priority(self, thread_id):
+        """ Aged priority of a resident thread """
+        return self.scheduler.priority(thread_id)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "threads": len(self.threads),
+            "resident_bytes": self.resident_bytes,
+            "ram_limit": self.ram_limit,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+            "bytes_evicted": self.bytes_evicted,
+        }
@@ -0,0 +1,147 @@
+# Glyph Decay - Vectorized Weight Decay for Long-Term Layers (Lyra v1.0)
+# ---------------------------------------------------------------------
+# Keeps the weights of long-term nodes in NumPy columns so decay and
+# pruning run as array operations. Decayed weights are evaluated lazily:
+# a node is only touched when it is read, re-weighted or pruned.
+#
+# Example:
+#   decay = DecayEngine({"ltm5": 0.01, "ltma": 0.05}, per="cycle")
+#   glyph = GlyphMatrix(decay=decay, prune_thresholds={"ltm5": 0.15})
+
+import math
+import time
+
+import numpy as np
+
+
+class DecayColumn:
+    """
+    Struct-of-arrays weight store for one layer.
+    Row i holds a base weight and the clock value it was last set at; the
+    effective weight is base * (1 - rate) ** (now - stamp). Tracked nodes keep
+    their row number in node.due, which long-term layers do not otherwise use.
+    """
+    def __init__(self, rate, capacity=1024):
+        if not 0.0 <= rate < 1.0:
+            raise ValueError(f"decay rate must be in [0, 1), got {rate}")
+        self.rate = rate
+        self.log_keep = math.log1p(-rate)
+        self.base = np.zeros(capacity)
+        self.stamp = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.nodes = np.empty(capacity, dtype=object)
+        self.size = 0
+        self.dead = 0
+
+    def _grow(self):
+        capacity = len(self.base) * 2
+        for name in ("base", "stamp", "alive", "nodes"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype) if name != "nodes" else np.empty(capacity, dtype=object)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def admit(self, node, now):
+        if self.size == len(self.base):
+            self._grow()
+        row = self.size
+        self.base[row] = node.weight
+        self.stamp[row] = now
+        self.alive[row] = True
+        self.nodes[row] = node
+        node.due = row
+        self.size += 1
+
+    def release(self, node, now):
+        """ Stops tracking node, writing its decayed weight back onto it """
+        row = node.due
+        node.weight = self.weight(row, now)
+        self.alive[row] = False
+        self.nodes[row] = None
+        self.dead += 1
+        if self.dead > 1024 and self.dead * 2 > self.size:
+            self.compact()
+
+    def weight(self, row, now):
+        return float(self.base[row] * math.exp(self.log_keep * (now - self.stamp[row])))
+
+    def reset(self, row, weight, now):
+        self.base[row] = weight
+        self.stamp[row] = now
+
+    def effective(self, now):
+        n = self.size
+        return self.base[:n] * np.exp(self.log_keep * (now - self.stamp[:n]))
+
+    def apply(self, now):
+        """ Folds elapsed decay into every base weight in one vectorized pass """
+        n = self.size
+        self.base[:n] = self.effective(now)
+        self.stamp[:n] = now
+
+    def below(self, threshold, now):
+        """ Live nodes whose decayed weight is under threshold """
+        n = self.size
+        mask = self.alive[:n] & (self.effective(now) < threshold)
+        return self.nodes[:n][mask].tolist()
+
+    def compact(self):
+        """ Masked compaction of released rows; renumbers the surviving nodes """
+        n = self.size
+        keep = self.alive[:n].copy()
+        survivors = int(keep.sum())
+        for name in ("base", "stamp", "alive", "nodes"):
+            column = getattr(self, name)
+            column[:survivors] = column[:n][keep]
+        self.nodes[survivors:n] = None
+        self.alive[survivors:n] = False
+        for row, node in enumerate(self.nodes[:survivors].tolist()):
+            node.due = row
+        self.size = survivors
+        self.dead = 0
+
+
+class DecayEngine:
+    """
+    Per-layer exponential decay. rates maps a layer name to the fraction of
+    weight lost per cycle (per="cycle") or per second (per="second").
+    """
+    def __init__(self, rates, per="cycle"):
+        if per not in ("cycle", "second"):
+            raise ValueError("per must be 'cycle' or 'second'")
+        self.per = per
+        self.columns = {layer: DecayColumn(rate) for layer, rate in rates.items()}
+
+    def now(self, cycle_count):
+        return cycle_count if self.per == "cycle" else time.time()
+
+    def tracks(self, node):
+        return node.layer in self.columns
+
+    def admit(self, node, cycle_count, since=None):
+        """ Tracks node; since is the clock value its weight was current at (default: now) """
+        self.columns[node.layer].admit(node, self.now(cycle_count) if since is None else since)
+
+    def release(self, node, cycle_count):
+        self.columns[node.layer].release(node, self.now(cycle_count))
+
+    def decayed(self, layer, weight, since, cycle_count):
+        """ Weight of an untracked layer row that was current at clock value since """
+        column = self.columns.get(layer)
+        if column is None:
+            return weight
+        return float(weight * math.exp(column.log_keep * (self.now(cycle_count) - since)))
+
+    def weight(self, node, cycle_count):
+        return self.columns[node.layer].weight(node.due, self.now(cycle_count))
+
+    def reset(self, node, weight, cycle_count):
+        self.columns[node.layer].reset(node.due, weight, self.now(cycle_count))
+
+    def apply(self, cycle_count):
+        now = self.now(cycle_count)
+        for column in self.columns.values():
+            column.apply(now)
+
+    def below(self, layer, threshold, cycle_count):
+        return self.columns[layer].below(threshold, self.now(cycle_count))
@@ -0,0 +1,391 @@
+# Glyph Journal - Durable Storage for the Glyph Matrix (Lyra v1.0)
+# ----------------------------------------------------------------
+# Append-only binary journal of store/place/drop/weight/tag/cycle events,
+# plus compacted snapshots that are memory-mapped on load. Long-term layers
+# (LTM5, LTMA) stay cold in the mapping until something first touches them.
+#
+# Example:
+#   glyph = load_matrix("lyra.journal", "lyra.snapshot", checkpoint_every=100_000)
+#   glyph.store("trust_broken", {"emotion": "betrayal"})
+#   glyph.checkpoint()
+
+from itertools import chain
+import json
+import mmap
+import os
+import struct
+
+from glyph_matrix import GlyphMatrix, SacredNode, _NO_CONTEXT, _intern, reserve_node_ids
+
+LAYER_NAMES = ("fc", "stm", "mm", "lm", "ltm5", "ltma")
+LAYER_CODES = {name: code for code, name in enumerate(LAYER_NAMES)}
+COLD_LAYERS = ("ltm5", "ltma")  # Left in the mapping until first access
+
+# Journal file: header, then records of (op, payload length, payload)
+JOURNAL_MAGIC = b"GLYPHJ01"
+JOURNAL_HEADER = struct.Struct("<8sQ")  # magic, generation
+RECORD = struct.Struct("<BI")
+OP_STORE, OP_PLACE, OP_DROP, OP_WEIGHT, OP_TAG, OP_CYCLE = range(6)
+_STORE = struct.Struct("<Qdd")   # id, timestamp, weight (+ symbol, context, tags as JSON)
+_PLACE = struct.Struct("<QBq")   # id, layer code, due cycle
+_DROP = struct.Struct("<Q")
+_WEIGHT = struct.Struct("<Qd")
+_TAG = struct.Struct("<Q")       # id (+ tag as JSON)
+_CYCLE = struct.Struct("<q")
+_LEN = struct.Struct("<I")
+
+# Snapshot file: header, fixed-size row table ordered by layer, string heap
+SNAPSHOT_MAGIC = b"GLYPHS01"
+SNAPSHOT_HEADER = struct.Struct("<8sqQQQ6Q")  # magic, cycle, max id, generation, journal offset, layer counts
+ROW = struct.Struct("<QddqB3xQIII")  # id, timestamp, weight, due, layer, heap offset, symbol/context/tags lengths
+
+
+_decode = json.JSONDecoder().decode
+
+
+def _dump(value):
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _encode_node(node):
+    context = b"" if node.context is _NO_CONTEXT else _dump(dict(node.context))
+    return _dump(node.symbol), context, _dump(list(node.tags))
+
+
+def _build_node(node_id, timestamp, weight, symbol, context, tags, seen=None):
+    # Bypasses __init__ so restored nodes keep their ids and timestamps.
+    # seen memoizes decoded symbols and tag tuples, which are immutable and heavily repeated.
+    if seen is None:
+        seen = {}
+    node = SacredNode.__new__(SacredNode)
+    node.id = node_id
+    node.timestamp = timestamp
+    node.weight = weight
+    node.symbol = seen.get(symbol)
+    if node.symbol is None:
+        node.symbol = seen[symbol] = _intern(_decode(symbol.decode("utf-8")))
+    node.context = _decode(context.decode("utf-8")) if context else _NO_CONTEXT
+    node.tags = seen.get(tags)
+    if node.tags is None:
+        node.tags = seen[tags] = tuple(_intern(tag) for tag in _decode(tags.decode("utf-8")))
+    node.cycles_in_layer = 0
+    node.layer = None
+    node.due = 0
+    return node
+
+
+class GlyphSnapshot:
+    """
+    Read-only, memory-mapped view of a compacted snapshot.
+    Opening only parses the header; rows are materialized per layer on demand.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.cycle_count, self.max_id, self.generation, self.journal_offset, *counts = \
+            SNAPSHOT_HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a glyph snapshot")
+        self.layer_counts = dict(zip(LAYER_NAMES, counts))
+        self._layer_start = {}
+        row = 0
+        for name in LAYER_NAMES:
+            self._layer_start[name] = row
+            row += self.layer_counts[name]
+
+    def iter_layer(self, name):
+        view = self._map
+        seen = {}
+        start = self._layer_start[name]
+        for row in range(start, start + self.layer_counts[name]):
+            node_id, timestamp, weight, due, _, heap, sym_len, ctx_len, tag_len = \
+                ROW.unpack_from(view, SNAPSHOT_HEADER.size + row * ROW.size)
+            ctx_at = heap + sym_len
+            tag_at = ctx_at + ctx_len
+            node = _build_node(node_id, timestamp, weight, view[heap:ctx_at],
+                               view[ctx_at:tag_at], view[tag_at:tag_at + tag_len], seen)
+            node.due = due
+            yield node
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def write_snapshot(glyph, path, generation=0, journal_offset=JOURNAL_HEADER.size):
+    """
+    Writes the matrix to path atomically (temp file + rename).
+    Cold layers are streamed straight from their current snapshot rows,
+    with any decay since that snapshot folded into the written weights.
+    """
+    counts = [len(glyph._layers()[name]) for name in LAYER_NAMES]
+    heap_at = SNAPSHOT_HEADER.size + sum(counts) * ROW.size
+    rows = bytearray()
+    max_id = 0
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.seek(heap_at)
+        for name in LAYER_NAMES:
+            layer = glyph._layers()[name]
+            if isinstance(layer._loader, _ColdRows):
+                # Untouched snapshot rows first, then nodes added since the restore
+                loader = layer._loader
+                weighed = chain(((node, loader.weight(node)) for node in loader.raw()),
+                                ((node, glyph.weight_of(node)) for node in list(layer._nodes.values())))
+            else:
+                weighed = ((node, glyph.weight_of(node)) for node in list(layer))
+            for node, weight in weighed:
+                symbol, context, tags = _encode_node(node)
+                rows += ROW.pack(node.id, node.timestamp, float(weight), node.due,
+                                 LAYER_CODES[name], heap_at, len(symbol), len(context), len(tags))
+                f.write(symbol)
+                f.write(context)
+                f.write(tags)
+                heap_at += len(symbol) + len(context) + len(tags)
+                max_id = max(max_id, node.id)
+        f.seek(0)
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, glyph.cycle_count, max_id,
+                                     generation, journal_offset, *counts))
+        f.write(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class GlyphJournal:
+    """
+    Append-only event log for a GlyphMatrix.
+    Every checkpoint writes a snapshot and starts a new journal generation,
+    so a crash between the two steps never replays events twice.
+    """
+    def __init__(self, path, snapshot_path=None, checkpoint_every=None):
+        self.path = path
+        self.snapshot_path = snapshot_path or path + ".snapshot"
+        self.checkpoint_every = checkpoint_every
+        self.events_since_checkpoint = 0
+        # A missing or header-less journal holds no events (e.g. a crash inside roll_over)
+        self.created = not os.path.exists(path) or os.path.getsize(path) < JOURNAL_HEADER.size
+        if self.created:
+            self._start_generation(0)
+        with open(path, "rb") as f:
+            magic, self.generation = JOURNAL_HEADER.unpack(f.read(JOURNAL_HEADER.size))
+        if magic != JOURNAL_MAGIC:
+            raise ValueError(f"{path} is not a glyph journal")
+        self._file = open(path, "ab")
+
+    def _start_generation(self, generation):
+        with open(self.path, "wb") as f:
+            f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, generation))
+            f.flush()
+            os.fsync(f.fileno())
+        self.generation = generation
+
+    def _append(self, op, payload):
+        self._file.write(RECORD.pack(op, len(payload)))
+        self._file.write(payload)
+        self.events_since_checkpoint += 1
+
+    def store(self, node):
+        symbol, context, tags = _encode_node(node)
+        self._append(OP_STORE, _STORE.pack(node.id, node.timestamp, float(node.weight))
+                     + _LEN.pack(len(symbol)) + symbol + _LEN.pack(len(context)) + context + tags)
+
+    def place(self, node):
+        self._append(OP_PLACE, _PLACE.pack(node.id, LAYER_CODES[node.layer], node.due))
+
+    def drop(self, node):
+        self._append(OP_DROP, _DROP.pack(node.id))
+
+    def weight(self, node):
+        self._append(OP_WEIGHT, _WEIGHT.pack(node.id, float(node.weight)))
+
+    def tag(self, node, tag):
+        self._append(OP_TAG, _TAG.pack(node.id) + _dump(tag))
+
+    def cycle(self, cycle_count):
+        self._append(OP_CYCLE, _CYCLE.pack(cycle_count))
+
+    def flush(self, sync=False):
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def checkpoint_due(self):
+        return bool(self.checkpoint_every) and self.events_since_checkpoint >= self.checkpoint_every
+
+    def checkpoint(self, glyph):
+        """ Compacts the journal into a fresh snapshot and starts the next generation """
+        self.flush(sync=True)
+        write_snapshot(glyph, self.snapshot_path, generation=self.generation + 1)
+        self.roll_over(self.generation + 1)
+
+    def roll_over(self, generation):
+        self._file.close()
+        self._start_generation(generation)
+        self._file = open(self.path, "ab")
+        self.events_since_checkpoint = 0
+
+    def close(self):
+        self.flush(sync=True)
+        self._file.close()
+
+    def events(self, offset=JOURNAL_HEADER.size):
+        """ Yields (op, payload) from offset; a torn trailing record ends the stream """
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while True:
+                head = f.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    return
+                op, length = RECORD.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length:
+                    return
+                yield op, payload
+
+
+class _ColdRows:
+    """ Loader for a cold layer: indexes rows as they are materialized """
+    def __init__(self, glyph, snapshot, name):
+        self.glyph = glyph
+        self.snapshot = snapshot
+        self.name = name
+        # Row weights were current when the snapshot was taken, so decay runs
+        # from there, not from whenever the layer is first warmed
+        decay = glyph._decay
+        self.since = decay.now(snapshot.cycle_count) if decay is not None else None
+
+    def raw(self):
+        return self.snapshot.iter_layer(self.name)
+
+    def weight(self, node):
+        # Current weight of a raw (untracked) row: its snapshot weight decayed since then
+        decay = self.glyph._decay
+        if decay is None:
+            return node.weight
+        return decay.decayed(self.name, node.weight, self.since, self.glyph.cycle_count)
+
+    def __call__(self):
+        for node in self.raw():
+            node.layer = self.name
+            self.glyph._index(node)
+            self.glyph._track(node, self.since)
+            if self.name == "ltm5":
+                self.glyph._file(node)
+            yield node
+
+
+def _restore_snapshot(glyph, snapshot):
+    glyph.cycle_count = snapshot.cycle_count
+    reserve_node_ids(snapshot.max_id)
+    for name in LAYER_NAMES:
+        layer = glyph._layers()[name]
+        if name in COLD_LAYERS:
+            layer.defer(snapshot.layer_counts[name], _ColdRows(glyph, snapshot, name))
+            continue
+        for node in snapshot.iter_layer(name):
+            _admit(glyph, node, layer)
+            glyph._index(node)
+
+
+def _admit(glyph, node, layer):
+    # Places a restored node without re-journaling or rescheduling it.
+    # Indexing is left to the caller: a re-placed node is already indexed.
+    layer.add(node)
+    node.layer = layer.name
+    if layer.name in glyph.PROMOTION_CYCLES:
+        glyph._wheel[layer.name][node.due].append(node)
+    else:
+        glyph._track(node)
+
+
+def _replay(glyph, journal, offset):
+    nodes = {node.id: node for name in LAYER_NAMES if name not in COLD_LAYERS
+             for node in glyph._layers()[name]}
+    warmed = [False]
+
+    def lookup(node_id):
+        if node_id not in nodes and not warmed[0]:
+            glyph._warm()  # Event touches a cold node: materialize once, then map everything
+            nodes.update((node.id, node) for node in glyph._all_nodes())
+            warmed[0] = True
+        node = nodes.get(node_id)
+        return node if node is not None and node.layer is not None else None
+
+    max_id = 0
+    for op, payload in journal.events(offset):
+        if op == OP_STORE:
+            node_id, timestamp, weight = _STORE.unpack_from(payload, 0)
+            at = _STORE.size
+            (sym_len,) = _LEN.unpack_from(payload, at)
+            symbol = payload[at + _LEN.size:at + _LEN.size + sym_len]
+            at += _LEN.size + sym_len
+            (ctx_len,) = _LEN.unpack_from(payload, at)
+            context = payload[at + _LEN.size:at + _LEN.size + ctx_len]
+            tags = payload[at + _LEN.size + ctx_len:]
+            node = _build_node(node_id, timestamp, weight, symbol, context, tags)
+            _admit(glyph, node, glyph.fc)
+            glyph._index(node)
+            nodes[node_id] = node
+            max_id = max(max_id, node_id)
+        elif op == OP_CYCLE:
+            (glyph.cycle_count,) = _CYCLE.unpack(payload)
+        elif op == OP_PLACE:
+            node_id, code, due = _PLACE.unpack(payload)
+            node = lookup(node_id)
+            if node is None:
+                continue
+            glyph._unfile(node)
+            glyph._untrack(node)
+            glyph._layers()[node.layer].discard(node)
+            node.due = due
+            _admit(glyph, node, glyph._layers()[LAYER_NAMES[code]])
+            if node.layer == "ltm5":
+                glyph._file(node)
+        elif op == OP_DROP:
+            node = lookup(_DROP.unpack(payload)[0])
+            if node is not None:
+                glyph._discard(node)
+        elif op == OP_WEIGHT:
+            node_id, weight = _WEIGHT.unpack(payload)
+            node = lookup(node_id)
+            if node is not None:
+                node.update_weight(weight)
+                if glyph._decay is not None and glyph._decay.tracks(node):
+                    glyph._decay.reset(node, weight, glyph.cycle_count)
+        elif op == OP_TAG:
+            node = lookup(_TAG.unpack_from(payload, 0)[0])
+            if node is not None:
+                glyph.tag_node(node, json.loads(payload[_TAG.size:]))
+    reserve_node_ids(max_id)
+
+
+def load_matrix(journal_path, snapshot_path=None, checkpoint_every=None, **matrix_kwargs):
+    """
+    Rebuilds a GlyphMatrix from its latest snapshot plus the journal tail and
+    attaches the journal so further mutations keep being recorded.
+    """
+    journal = GlyphJournal(journal_path, snapshot_path, checkpoint_every)
+    glyph = GlyphMatrix(**matrix_kwargs)
+    offset = JOURNAL_HEADER.size
+    if os.path.exists(journal.snapshot_path):
+        snapshot = GlyphSnapshot(journal.snapshot_path)
+        if not journal.created and snapshot.generation not in (journal.generation, journal.generation + 1):
+            # Replaying from any other snapshot would drop acknowledged writes
+            snapshot.close()
+            journal.close()
+            raise ValueError(f"{journal.snapshot_path} is generation {snapshot.generation} but"
+                             f" {journal_path} is generation {journal.generation}")
+        _restore_snapshot(glyph, snapshot)
+        if snapshot.generation != journal.generation:
+            # Crashed after the snapshot but before the journal rolled over (or
+            # while it did): the old journal is already folded into the snapshot
+            journal.roll_over(snapshot.generation)
+            offset = None
+        else:
+            offset = snapshot.journal_offset
+    if offset is not None:
+        _replay(glyph, journal, offset)
+    glyph.attach_journal(journal)
+    return glyph
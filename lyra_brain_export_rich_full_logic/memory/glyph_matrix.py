@@ -3,52 +3,235 @@
 # Stores emotionally weighted symbolic nodes with optional context and timestamp.
 # Acts as the primary long-term memory layer and lookup engine.
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain
 from datetime import datetime
-import uuid
+from types import MappingProxyType
+import itertools
+import sys
 import time
 
+from glyph_warehouse import GlyphWarehouse
+
+_node_ids = itertools.count(1)  # Process-wide integer node ids (cheaper than uuid4)
+_NO_CONTEXT = MappingProxyType({})  # Shared read-only context for context-less nodes
+
+def _intern(tag):
+    return sys.intern(tag) if type(tag) is str else tag
+
+def reserve_node_ids(last_id):
+    """ Ensures freshly created nodes get ids above last_id (used when restoring) """
+    global _node_ids
+    _node_ids = itertools.count(max(next(_node_ids), last_id + 1))
+
 class SacredNode:
+    # Slotted: no per-instance __dict__, tags held as a tuple of interned strings
+    __slots__ = ("symbol", "context", "weight", "id", "timestamp", "tags", "cycles_in_layer", "layer", "due")
+
     def __init__(self, symbol, context=None, weight=0.5, tags=None):
         self.symbol = symbol
-        self.context = context if context else {}
+        self.context = context if context else _NO_CONTEXT
         self.weight = weight
-        self.id = str(uuid.uuid4())
+        self.id = next(_node_ids)
         self.timestamp = time.time()
-        self.tags = tags if tags else []
+        self.tags = tuple(_intern(tag) for tag in tags) if tags else ()
         self.cycles_in_layer = 0
+        self.layer = None
+        self.due = 0  # Cycle at which the matrix next evaluates this node
+
+    def emotion(self):
+        return self.context.get("emotion", "neutral")
 
     def update_weight(self, new_weight):
         self.weight = new_weight
 
     def add_tag(self, tag):
         if tag not in self.tags:
-            self.tags.append(tag)
+            self.tags = self.tags + (_intern(tag),)
 
     def get_node_info(self):
         return {
             "symbol": self.symbol,
-            "context": self.context,
+            "context": self.context if self.context is not _NO_CONTEXT else {},
             "weight": self.weight,
             "id": self.id,
             "timestamp": self.timestamp,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "cycles_in_layer": self.cycles_in_layer
         }
 
+class NodeLayer:
+    """
+    Insertion-ordered set of nodes keyed by node id.
+    Add, discard, membership and pop-newest are O(1); drain() empties the
+    layer in one pass so FC push-down no longer pops from the front.
+    A layer restored from a snapshot may hold cold rows that are only
+    materialized by warm(), which iteration, pop and drain call first.
+    Tombstoned nodes (layer reset to None) stay in place, hidden from
+    iteration and len(), until compact() sweeps them out.
+    """
+    __slots__ = ("name", "_nodes", "_cold", "_loader", "_dead")
+
+    def __init__(self, name):
+        self.name = name
+        self._nodes = {}
+        self._cold = 0
+        self._loader = None
+        self._dead = 0
+
+    def defer(self, count, loader):
+        """ Registers count cold nodes that loader() will yield on first access """
+        self._cold, self._loader = count, loader
+
+    def warm(self):
+        if self._loader is not None:
+            loader, self._loader, self._cold = self._loader, None, 0
+            for node in loader():
+                self._nodes[node.id] = node
+
+    def add(self, node):
+        self._nodes[node.id] = node
+
+    def extend(self, nodes):
+        self._nodes.update((node.id, node) for node in nodes)
+
+    def discard(self, node):
+        self._nodes.pop(node.id, None)
+
+    def bury(self, node):
+        """ Counts a tombstoned node that is still physically in the layer """
+        self._dead += 1
+
+    def compact(self):
+        if self._dead:
+            name = self.name
+            self._nodes = {node_id: node for node_id, node in self._nodes.items() if node.layer == name}
+            self._dead = 0
+
+    def pop(self):
+        self.warm()
+        while True:
+            node = self._nodes.popitem()[1]
+            if node.layer == self.name:
+                return node
+            self._dead -= 1
+
+    def drain(self):
+        self.warm()
+        nodes = list(self)
+        self._nodes.clear()
+        self._dead = 0
+        return nodes
+
+    def __contains__(self, node):
+        return self._nodes.get(node.id) is node and node.layer == self.name
+
+    def __iter__(self):
+        self.warm()
+        if not self._dead:
+            return iter(self._nodes.values())
+        name = self.name
+        return (node for node in self._nodes.values() if node.layer == name)
+
+    def __len__(self):
+        return len(self._nodes) + self._cold - self._dead
+
 class GlyphMatrix:
-    def __init__(self, max_threads=5, min_threads=1, thread_limit=10):
+    # Cycles a node spends in a layer before cycle_nodes evaluates it
+    PROMOTION_CYCLES = {"stm": 5, "mm": 10, "lm": 10}
+    # Share of tombstoned nodes that triggers a compaction pass
+    COMPACT_RATIO = 0.25
+    # prune_nodes drops nodes whose (decayed) weight falls below these
+    PRUNE_THRESHOLDS = {"ltm5": 0.1, "ltma": 0.2}
+    # Only the long-term layers may decay; their nodes never sit on the promotion wheel
+    DECAY_LAYERS = ("ltm5", "ltma")
+
+    def __init__(self, max_threads=5, min_threads=1, thread_limit=10, check_aggregates=False,
+                 decay=None, prune_thresholds=None):
         self.max_threads = max(min(max_threads, thread_limit), min_threads)
         self.min_threads = min_threads
         self.thread_limit = thread_limit
-        self.fc = []   # Forward Cache
-        self.stm = []  # Short-Term Memory
-        self.mm = []   # Mid-Memory (active tags)
-        self.lm = []   # Long-Memory (tag warehouse)
-        self.ltm5 = [] # Long-Term Memory (compressed, contextual)
-        self.ltma = [] # Long-Term Memory Archive (archived nodes)
-        self.ltm_warehouse = {}  # Hierarchical dictionary for LTM
+        self.fc = NodeLayer("fc")      # Forward Cache
+        self.stm = NodeLayer("stm")    # Short-Term Memory
+        self.mm = NodeLayer("mm")      # Mid-Memory (active tags)
+        self.lm = NodeLayer("lm")      # Long-Memory (tag warehouse)
+        self.ltm5 = NodeLayer("ltm5")  # Long-Term Memory (compressed, contextual)
+        self.ltma = NodeLayer("ltma")  # Long-Term Memory Archive (archived nodes)
+        self._layer_map = {layer.name: layer for layer in
+                           (self.fc, self.stm, self.mm, self.lm, self.ltm5, self.ltma)}
+        self.ltm_warehouse = GlyphWarehouse()  # Trie over "tonality:anagram" species paths
         self.cycle_count = 0
+        self._in_cycle = False
+        # Promotion wheel: layer -> {due cycle: [nodes]}; stale entries are skipped on pop
+        self._wheel = {name: defaultdict(list) for name in self.PROMOTION_CYCLES}
+        # Secondary indexes: key -> {node.id: node}, insertion ordered
+        self._by_symbol = defaultdict(dict)
+        self._by_emotion = defaultdict(dict)
+        self._by_tag = defaultdict(dict)
+        # Incremental aggregate: emotion -> Counter(symbol -> resident nodes)
+        self._emotion_symbols = defaultdict(Counter)
+        self.check_aggregates = check_aggregates  # Verify aggregates against a full scan (tests)
+        self._tombstones = 0  # Forgotten nodes not yet swept from layers and indexes
+        self._journal = None  # Optional GlyphJournal receiving every mutation
+        self.prune_thresholds = dict(self.PRUNE_THRESHOLDS, **(prune_thresholds or {}))
+        if decay is not None and not set(decay.columns) <= set(self.DECAY_LAYERS):
+            raise ValueError(f"decay is only supported on {self.DECAY_LAYERS}")
+        self._decay = decay  # Optional glyph_decay.DecayEngine for long-term weights
+
+    def attach_journal(self, journal):
+        """ Routes store/move/forget/weight events to an append-only journal """
+        self._journal = journal
+
+    def checkpoint(self):
+        """ Writes a compacted snapshot through the attached journal """
+        if self._journal is not None:
+            self._journal.checkpoint(self)
+
+    def _layers(self):
+        return self._layer_map
+
+    def _warm(self):
+        # Indexed operations need every node materialized, including snapshot-backed ones
+        for layer in self._layer_map.values():
+            layer.warm()
+
+    def _all_nodes(self):
+        return chain(self.fc, self.stm, self.mm, self.lm, self.ltm5, self.ltma)
+
+    def _index(self, node):
+        self._by_symbol[node.symbol][node.id] = node
+        self._by_emotion[node.emotion()][node.id] = node
+        self._emotion_symbols[node.emotion()][node.symbol] += 1
+        for tag in node.tags:
+            self._by_tag[tag][node.id] = node
+
+    def _unindex(self, node):
+        for index, keys in ((self._by_symbol, [node.symbol]),
+                            (self._by_emotion, [node.emotion()]),
+                            (self._by_tag, node.tags)):
+            for key in keys:
+                bucket = index.get(key)
+                if bucket is not None:
+                    bucket.pop(node.id, None)
+                    if not bucket:
+                        del index[key]
+        self._uncount(node)
+
+    def _uncount(self, node):
+        # Removes a resident node from the emotion aggregate and marks it gone
+        emotion = node.emotion()
+        symbols = self._emotion_symbols.get(emotion)
+        if symbols is not None and node.layer is not None:
+            symbols[node.symbol] -= 1
+            if symbols[node.symbol] <= 0:
+                del symbols[node.symbol]
+                if not symbols:
+                    del self._emotion_symbols[emotion]
+        self._unfile(node)
+        self._untrack(node)
+        node.layer = None
+        if self._journal is not None:
+            self._journal.drop(node)
 
     def store(self, symbol: str, context: dict = None):
         """
@@ -58,134 +241,408 @@ class GlyphMatrix:
         weight = context.get("intensity", 0.5) if context else 0.5
         tags = [context.get("emotion", "neutral")] if context else ["neutral"]
         node = SacredNode(symbol=symbol, context=context, weight=weight, tags=tags)
-        self.fc.append(node)
+        node.layer = "fc"
+        self.fc.add(node)
+        self._index(node)
+        if self._journal is not None:
+            self._journal.store(node)
+        return node
+
+    def store_many(self, items, batch_size=10_000):
+        """
+        Store many (symbol, context) pairs from a list or generator.
+        Weights and emotion tags are derived in one pass per batch, FC is
+        extended in bulk and each index bucket is updated once per batch.
+        Example: glyph.store_many((line.symbol, line.context) for line in log)
+        Returns the number of nodes stored.
+        """
+        neutral = (_intern("neutral"),)
+        tag_tuples = {}  # emotion -> shared single-tag tuple
+        stored = 0
+        batch = []
+        for pair in items:
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                stored += self._store_batch(batch, neutral, tag_tuples)
+                batch = []
+        if batch:
+            stored += self._store_batch(batch, neutral, tag_tuples)
+        return stored
+
+    def _store_batch(self, batch, neutral, tag_tuples):
+        now = time.time()
+        new_node = SacredNode.__new__
+        ids = _node_ids
+        nodes = []
+        by_symbol = defaultdict(dict)
+        by_emotion = defaultdict(dict)
+        counts = defaultdict(Counter)  # Applied to the aggregate only once the batch is in FC
+        for symbol, context in batch:
+            # Same fields as SacredNode.__init__, minus a clock read and tag tuple per node
+            node = new_node(SacredNode)
+            node.symbol = symbol
+            node.id = next(ids)
+            node.timestamp = now
+            node.cycles_in_layer = 0
+            node.layer = "fc"
+            node.due = 0
+            if context:
+                node.context = context
+                node.weight = context.get("intensity", 0.5)
+                emotion = context.get("emotion", "neutral")
+                tags = tag_tuples.get(emotion)
+                if tags is None:
+                    tags = tag_tuples[emotion] = (_intern(emotion),)
+                node.tags = tags
+            else:
+                node.context = _NO_CONTEXT
+                node.weight = 0.5
+                emotion = "neutral"
+                node.tags = neutral
+            nodes.append(node)
+            by_symbol[symbol][node.id] = node
+            by_emotion[emotion][node.id] = node
+            counts[emotion][symbol] += 1
+        self.fc.extend(nodes)
+        for emotion, symbols in counts.items():
+            self._emotion_symbols[emotion].update(symbols)
+        for key, group in by_symbol.items():
+            self._by_symbol[key].update(group)
+        for key, group in by_emotion.items():
+            self._by_emotion[key].update(group)
+            # store() tags each node with its emotion, so the tag buckets match
+            self._by_tag[tag_tuples.get(key, neutral)[0]].update(group)
+        if self._journal is not None:
+            for node in nodes:
+                self._journal.store(node)
+        return len(nodes)
 
-    def retrieve(self, filter_fn):
+    def tag_node(self, node, tag):
+        """ Adds a tag to a stored node and keeps the tag index and warehouse in step """
+        filed = self.warehouse_worthy(node)
+        node.add_tag(tag)
+        if node.layer is not None:
+            self._by_tag[tag][node.id] = node
+            if node.layer == "ltm5" and not filed:
+                self._file(node)  # e.g. "sacred" added to a node already in LTM5
+            if self._journal is not None:
+                self._journal.tag(node, tag)
+
+    def retrieve(self, filter_fn=None, *, symbol=None, emotion=None, tag=None, layer=None, min_weight=None):
         """
-        Retrieve memory nodes matching the given filter function.
-        Example: glyph.retrieve(lambda x: x['context'].get('emotion') == 'betrayal')
+        Retrieve memory nodes by declarative query or by filter function.
+        Example: glyph.retrieve(emotion="betrayal", tag="important", min_weight=0.5)
+        Keyword queries are answered from the symbol/emotion/tag indexes and
+        yield node info lazily. A bare filter function falls back to the full
+        scan and returns a list, as before:
+        glyph.retrieve(lambda x: x['context'].get('emotion') == 'betrayal')
         """
-        all_nodes = self.fc + self.stm + self.mm + self.lm + self.ltm5 + self.ltma
-        return [node.get_node_info() for node in all_nodes if filter_fn(node.get_node_info())]
+        self._warm()
+        criteria = (symbol, emotion, tag, layer, min_weight)
+        if filter_fn is not None and all(c is None for c in criteria):
+            return [info for info in map(self._info, self._all_nodes()) if filter_fn(info)]
+        return self._query(filter_fn, symbol, emotion, tag, layer, min_weight)
+
+    def _query(self, filter_fn, symbol, emotion, tag, layer, min_weight):
+        postings = []
+        for index, key in ((self._by_symbol, symbol), (self._by_emotion, emotion), (self._by_tag, tag)):
+            if key is not None:
+                postings.append(index.get(key, {}))
+        if postings:
+            # Drive from the smallest posting list, verify the rest per node
+            candidates = tuple(min(postings, key=len).values())
+        elif layer is not None:
+            candidates = tuple(self._layers().get(layer, []))
+        else:
+            candidates = tuple(self._all_nodes())
+        for node in candidates:
+            if node.layer is None:
+                continue  # forgotten or discarded since the query started
+            if symbol is not None and node.symbol != symbol:
+                continue
+            if emotion is not None and node.emotion() != emotion:
+                continue
+            if tag is not None and tag not in node.tags:
+                continue
+            if layer is not None and node.layer != layer:
+                continue
+            if min_weight is not None and self.weight_of(node) < min_weight:
+                continue
+            info = self._info(node)
+            if filter_fn is None or filter_fn(info):
+                yield info
+
+    def _info(self, node):
+        # cycles_in_layer is derived from the due cycle instead of being ticked every cycle
+        threshold = self.PROMOTION_CYCLES.get(node.layer)
+        if threshold is not None:
+            node.cycles_in_layer = max(0, self.cycle_count - node.due + threshold)
+        info = node.get_node_info()
+        if self._decay is not None and self._decay.tracks(node):
+            info["weight"] = self.weight_of(node)
+        return info
+
+    def weight_of(self, node):
+        """ Current weight of a node, with any long-term decay evaluated lazily """
+        if self._decay is not None and self._decay.tracks(node):
+            return self._decay.weight(node, self.cycle_count)
+        return node.weight
+
+    def _track(self, node, since=None):
+        # since: decay clock value node.weight was current at (default: now)
+        if self._decay is not None and self._decay.tracks(node):
+            self._decay.admit(node, self.cycle_count, since)
+
+    def _untrack(self, node):
+        if self._decay is not None and self._decay.tracks(node):
+            self._decay.release(node, self.cycle_count)
 
     def summarize(self):
         """
         Return a list of unique symbols currently stored.
+        Read from the symbol index: O(unique symbols).
         """
-        all_nodes = self.fc + self.stm + self.mm + self.lm + self.ltm5 + self.ltma
-        return list(set(node.symbol for node in all_nodes))
+        self._warm()
+        if self.check_aggregates:
+            self.verify_aggregates()
+        return list(self._by_symbol)
+
+    def symbol_count(self, symbol):
+        """ Number of resident nodes carrying symbol, O(1) """
+        self._warm()
+        return len(self._by_symbol.get(symbol, ()))
 
     def forget(self, symbol_to_erase: str):
         """
         Optional memory deletion function, e.g. for self-hygiene or pruning.
         """
-        self.fc = [node for node in self.fc if node.symbol != symbol_to_erase]
-        self.stm = [node for node in self.stm if node.symbol != symbol_to_erase]
-        self.mm = [node for node in self.mm if node.symbol != symbol_to_erase]
-        self.lm = [node for node in self.lm if node.symbol != symbol_to_erase]
-        self.ltm5 = [node for node in self.ltm5 if node.symbol != symbol_to_erase]
-        self.ltma = [node for node in self.ltma if node.symbol != symbol_to_erase]
+        return self.forget_many((symbol_to_erase,))
+
+    def forget_many(self, symbols):
+        """
+        Erase every node carrying any of the given symbols.
+        Nodes are tombstoned through the symbol index, so they vanish from
+        retrieval and summaries at once; their layer and emotion/tag index
+        slots are reclaimed by compact(), which runs once tombstones reach
+        COMPACT_RATIO of the matrix. Returns the number of nodes erased.
+        """
+        self._warm()
+        layers = self._layers()
+        erased = 0
+        for symbol in symbols:
+            bucket = self._by_symbol.pop(symbol, None)
+            if not bucket:
+                continue
+            for node in bucket.values():
+                layers[node.layer].bury(node)
+                self._uncount(node)
+            erased += len(bucket)
+        self._tombstones += erased
+        self._maybe_compact()
+        return erased
 
-    def summarize_by_emotion(self):
+    def _maybe_compact(self):
+        if self._tombstones:
+            resident = sum(len(layer) for layer in self._layers().values())
+            if self._tombstones >= self.COMPACT_RATIO * (resident + self._tombstones):
+                self.compact()
+
+    def compact(self):
+        """ Sweeps tombstoned nodes out of the layers and the emotion/tag indexes """
+        for layer in self._layers().values():
+            layer.compact()
+        for index in (self._by_emotion, self._by_tag):
+            for key in list(index):
+                live = {node_id: node for node_id, node in index[key].items() if node.layer is not None}
+                if live:
+                    index[key] = live
+                else:
+                    del index[key]
+        self._tombstones = 0
+
+    def summarize_by_emotion(self, counts=False):
         """
         Groups symbols by their associated emotion tags for resonance analysis.
+        Built from incrementally maintained per-emotion counters; with
+        counts=True returns {emotion: {symbol: nodes}} in O(unique pairs),
+        otherwise one symbol entry per node as before.
         """
-        buckets = defaultdict(list)
-        all_nodes = self.fc + self.stm + self.mm + self.lm + self.ltm5 + self.ltma
-        for node in all_nodes:
-            emotion = node.context.get("emotion", "neutral")
-            buckets[emotion].append(node.symbol)
-        return dict(buckets)
+        self._warm()
+        if self.check_aggregates:
+            self.verify_aggregates()
+        if counts:
+            return {emotion: dict(symbols) for emotion, symbols in self._emotion_symbols.items()}
+        return {emotion: list(symbols.elements()) for emotion, symbols in self._emotion_symbols.items()}
+
+    def verify_aggregates(self):
+        """ Recomputes the aggregates with a full scan and raises AssertionError on drift """
+        symbols = Counter()
+        by_emotion = defaultdict(Counter)
+        for layer in self._layers().values():
+            for node in layer:
+                if node.layer != layer.name:
+                    raise AssertionError(f"node {node.id} listed in {layer.name} but marked {node.layer}")
+        for node in self._all_nodes():
+            symbols[node.symbol] += 1
+            by_emotion[node.emotion()][node.symbol] += 1
+        indexed = {symbol: len(nodes) for symbol, nodes in self._by_symbol.items()}
+        if indexed != dict(symbols):
+            raise AssertionError("symbol index drifted from resident nodes")
+        if dict(self._emotion_symbols) != dict(by_emotion):
+            raise AssertionError("emotion aggregates drifted from resident nodes")
 
     def move_node(self, node, from_layer, to_layer):
         """ Moves a node from one memory layer to another """
-        layers = {"fc": self.fc, "stm": self.stm, "mm": self.mm, "lm": self.lm, "ltm5": self.ltm5, "ltma": self.ltma}
-        if node in layers.get(from_layer, []):
-            layers[from_layer].remove(node)
-            layers.get(to_layer, self.fc).append(node)
-            node.cycles_in_layer = 0  # Reset cycle count in new layer
+        layers = self._layers()
+        if node.layer == from_layer and from_layer in layers:  # O(1): nodes track their own layer
+            self._unfile(node)
+            self._untrack(node)
+            layers[from_layer].discard(node)
+            self._place(node, layers.get(to_layer, self.fc))
+
+    def _place(self, node, layer):
+        layer.add(node)
+        node.layer = layer.name
+        node.cycles_in_layer = 0  # Reset cycle count in new layer
+        threshold = self.PROMOTION_CYCLES.get(layer.name)
+        if threshold is not None:
+            # Nodes placed during a cycle are counted by that same cycle
+            first = self.cycle_count if self._in_cycle else self.cycle_count + 1
+            node.due = first + threshold - 1
+            self._wheel[layer.name][node.due].append(node)
+        else:
+            self._track(node)
+            if layer is self.ltm5:
+                self._file(node)
+        if self._journal is not None:
+            self._journal.place(node)
+
+    def _due_nodes(self, layer):
+        for node in self._wheel[layer].pop(self.cycle_count, ()):
+            # Skip nodes that left (or re-entered) the layer since they were scheduled
+            if node.layer == layer and node.due == self.cycle_count:
+                node.cycles_in_layer = self.PROMOTION_CYCLES[layer]
+                yield node
+
+    def _discard(self, node):
+        """ Drops a node from its layer and from every index """
+        layer = self._layers().get(node.layer)
+        if layer is not None:
+            layer.discard(node)
+        self._unindex(node)
 
     def cycle_nodes(self):
-        """ Cycles nodes through FC, STM, MM, LM, LTM5, and LTMA based on weight and cycles """
+        """
+        Cycles nodes through FC, STM, MM, LM, LTM5, and LTMA based on weight and cycles.
+        Only nodes whose promotion falls due this cycle are touched.
+        """
         self.cycle_count += 1
-        # Automatic push-down every 2^n cycle
-        if self.cycle_count & (self.cycle_count - 1) == 0:  # Power of 2
-            # FC to STM
-            while len(self.fc) > 0:
-                node = self.fc.pop(0)
-                # Evaluate: important, tangential, or idle chatter
-                if "idle_chatter" in node.tags:
-                    continue  # Delete idle chatter
-                elif "important" in node.tags:
-                    self.move_node(node, "fc", "stm")
-                else:
-                    self.move_node(node, "fc", "stm")  # Default to STM for further evaluation
+        self._in_cycle = True
+        if self._journal is not None:
+            self._journal.cycle(self.cycle_count)
+        try:
+            # Automatic push-down every 2^n cycle
+            if self.cycle_count & (self.cycle_count - 1) == 0:  # Power of 2
+                # FC to STM
+                for node in self.fc.drain():
+                    # Evaluate: important, tangential, or idle chatter
+                    if "idle_chatter" in node.tags:
+                        self._unindex(node)  # Delete idle chatter
+                    else:
+                        self._place(node, self.stm)  # Important or not, STM evaluates further
 
-        # STM to MM/LM
-        for node in self.stm[:]:
-            node.cycles_in_layer += 1
-            if node.cycles_in_layer >= 5:  # After 5 cycles, evaluate
-                self.stm.remove(node)
+            # STM to MM/LM after 5 cycles
+            for node in self._due_nodes("stm"):
                 if "important" in node.tags:
                     self.move_node(node, "stm", "mm")
                 elif "tangential" in node.tags:
                     self.move_node(node, "stm", "lm")
                 else:
-                    continue  # Delete idle chatter
+                    self._discard(node)  # Delete idle chatter
 
-        # MM to LM
-        for node in self.mm[:]:
-            node.cycles_in_layer += 1
-            if node.cycles_in_layer >= 10:  # After 10 cycles, move to LM
-                self.mm.remove(node)
+            # MM to LM after 10 cycles
+            for node in self._due_nodes("mm"):
                 self.move_node(node, "mm", "lm")
 
-        # LM to LTM5
-        for node in self.lm[:]:
-            node.cycles_in_layer += 1
-            if node.cycles_in_layer >= 10:  # After 10 cycles, evaluate and move to LTM5
-                self.lm.remove(node)
-                tags = node.tags
-                if "sacred" in tags or "a137" in tags or "interesting" in node.tags:
-                    self.move_node(node, "lm", "ltm5")
-                    # Add to LTM warehouse with hierarchical tagging
-                    content = node.content
-                    self.add_to_warehouse(content, node)
+            # LM to LTM5 after 10 cycles
+            for node in self._due_nodes("lm"):
+                if self.warehouse_worthy(node):
+                    self.move_node(node, "lm", "ltm5")  # Filed in the LTM warehouse on arrival
                 elif "fluff" in node.tags:
                     self.move_node(node, "lm", "ltma")
                 else:
                     self.move_node(node, "lm", "ltm5")  # Default to LTM5
+        finally:
+            self._in_cycle = False
+        self._maybe_compact()
+        if self._journal is not None and self._journal.checkpoint_due():
+            self.checkpoint()
+
+    @staticmethod
+    def warehouse_worthy(node):
+        tags = node.tags
+        return "sacred" in tags or "a137" in tags or "interesting" in tags
 
     def add_to_warehouse(self, content, node):
-        # Hierarchical dictionary for species (e.g., "tone_0:anagram_0")
+        # Hierarchical index for species (e.g., "tone_0:anagram_0")
         parts = content.split(":")
         if len(parts) >= 2:
-            tonality, anagram = parts[0], parts[1]
-            node = self.ltm_warehouse
-            for part in [tonality, anagram]:
-                if part not in node:
-                    node[part] = {}
-                node = node[part]
-            node["node"] = node
+            self.ltm_warehouse.insert(parts, node.id)
+
+    def _file(self, node):
+        # LTM5 keeps sacred/a137/interesting nodes filed under their symbol path
+        if self.warehouse_worthy(node):
+            self.add_to_warehouse(node.symbol, node)
+
+    def _unfile(self, node):
+        if node.layer == "ltm5" and self.warehouse_worthy(node) and ":" in node.symbol:
+            self.ltm_warehouse.remove(node.symbol, node.id)
+
+    def retrieve_warehouse(self, prefix=""):
+        """
+        Yield node info for warehouse entries under a species prefix, sorted by path.
+        Example: glyph.retrieve_warehouse("tone_0")
+        """
+        self._warm()
+        for path, ids in self.ltm_warehouse.items(prefix):
+            bucket = self._by_symbol.get(path, {})
+            for node_id in ids:
+                node = bucket.get(node_id)
+                if node is not None:
+                    yield self._info(node)
 
     def prune_nodes(self):
-        self.ltm5 = [node for node in self.ltm5 if node.weight >= 0.1]
-        self.ltma = [node for node in self.ltma if node.weight >= 0.2]
+        """
+        Drops nodes whose weight is under their layer's prune threshold.
+        Decaying layers are screened with one vectorized mask over their weights.
+        """
+        for name, threshold in self.prune_thresholds.items():
+            layer = self._layers()[name]
+            layer.warm()
+            if self._decay is not None and name in self._decay.columns:
+                doomed = self._decay.below(name, threshold, self.cycle_count)
+            else:
+                doomed = [node for node in layer if node.weight < threshold]
+            for node in doomed:
+                self._discard(node)
+
+    def decay_weights(self):
+        """ Folds elapsed decay into the stored long-term weights in one vectorized pass """
+        if self._decay is not None:
+            self._decay.apply(self.cycle_count)
 
     def manage_thread_count(self):
         if len(self.stm) > self.max_threads:
             excess = len(self.stm) - self.max_threads
             for _ in range(excess):
-                node = self.stm.pop()
-                self.move_node(node, "stm", "mm")
+                self._place(self.stm.pop(), self.mm)
 
     def update_weighting(self, node, new_weight):
         node.update_weight(new_weight)
-        if node in self.fc:
-            self.move_node(node, "fc", "stm")
-        elif node in self.stm:
-            self.move_node(node, "stm", "mm")
-        elif node in self.mm:
-            self.move_node(node, "mm", "lm")
-        elif node in self.lm:
-            self.move_node(node, "lm", "ltm5")
\ No newline at end of file
+        if self._decay is not None and self._decay.tracks(node):
+            self._decay.reset(node, new_weight, self.cycle_count)
+        if self._journal is not None:
+            self._journal.weight(node)
+        next_layer = {"fc": "stm", "stm": "mm", "mm": "lm", "lm": "ltm5"}.get(node.layer)
+        if next_layer:
+            self.move_node(node, node.layer, next_layer)
\ No newline at end of file
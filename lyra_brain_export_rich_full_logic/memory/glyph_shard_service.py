@@ -0,0 +1,215 @@
+# Glyph Shard Service - Multi-Process Symbolic Memory (Lyra v1.0)
+# ---------------------------------------------------------------
+# Partitions nodes across worker processes by symbol hash. Each worker owns
+# a GlyphMatrix and runs its own cycle and prune; the coordinator fans calls
+# out and merges the answers. Request and reply payloads travel through a
+# per-worker shared-memory buffer, with the pipe carrying only the header.
+#
+# Example:
+#   with GlyphShardService(workers=4) as glyph:
+#       glyph.store("trust_broken", {"emotion": "betrayal"})
+#       glyph.cycle_nodes()
+#       glyph.retrieve(emotion="betrayal")
+
+from collections import Counter, defaultdict
+from multiprocessing import shared_memory
+import itertools
+import multiprocessing
+import pickle
+
+import glyph_matrix
+from concurrent_glyph_matrix import shard_of
+
+BUFFER_SIZE = 8 * 1024 * 1024  # Per-direction shared-memory buffer per worker
+
+
+class _Channel:
+    """ One pipe end plus the shared-memory buffers used for large payloads """
+    def __init__(self, conn, send_buf, recv_buf):
+        self.conn = conn
+        self.send_buf = send_buf
+        self.recv_buf = recv_buf
+
+    def send(self, op, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) <= self.send_buf.size:
+            self.send_buf.buf[:len(payload)] = payload
+            self.conn.send((op, None, len(payload)))
+        else:
+            self.conn.send((op, payload, 0))  # Too big for the buffer: go through the pipe
+
+    def recv(self):
+        op, payload, length = self.conn.recv()
+        if payload is None:
+            payload = bytes(self.recv_buf.buf[:length])
+        return op, pickle.loads(payload)
+
+
+def _worker(index, shards, conn, request_name, reply_name, matrix_kwargs):
+    # Strided ids keep node ids unique across all shards
+    glyph_matrix._node_ids = itertools.count(index + 1, shards)
+    request = shared_memory.SharedMemory(name=request_name)
+    reply = shared_memory.SharedMemory(name=reply_name)
+    channel = _Channel(conn, reply, request)
+    glyph = glyph_matrix.GlyphMatrix(**matrix_kwargs)
+    handlers = {
+        "store_many": lambda items: glyph.store_many(items),
+        "retrieve": lambda criteria: list(glyph.retrieve(**criteria)),
+        "summarize": lambda _: glyph.summarize(),
+        "summarize_by_emotion": lambda _: glyph.summarize_by_emotion(counts=True),
+        "forget_many": lambda symbols: glyph.forget_many(symbols),
+        "cycle_nodes": lambda _: glyph.cycle_nodes(),
+        "prune_nodes": lambda _: glyph.prune_nodes(),
+        "len": lambda _: sum(len(layer) for layer in glyph._layers().values()),
+    }
+    try:
+        while True:
+            op, value = channel.recv()
+            if op == "stop":
+                break
+            try:
+                channel.send("ok", handlers[op](value))
+            except Exception as exc:
+                channel.send("error", exc)
+    finally:
+        request.close()
+        reply.close()
+        conn.close()
+
+
+class GlyphShardService:
+    """
+    Coordinator for a pool of GlyphMatrix worker processes.
+    store() is buffered per shard and shipped as store_many batches, flushed
+    automatically before any read, cycle or forget so ordering is preserved.
+    Node ids are unique across shards; node objects stay in their worker,
+    so reads return node info dicts.
+    """
+    def __init__(self, workers=4, batch_size=5_000, **matrix_kwargs):
+        self.batch_size = batch_size
+        self._pending = defaultdict(list)
+        self._pending_count = 0
+        self._channels = []
+        self._processes = []
+        self._buffers = []
+        for index in range(workers):
+            request = shared_memory.SharedMemory(create=True, size=BUFFER_SIZE)
+            reply = shared_memory.SharedMemory(create=True, size=BUFFER_SIZE)
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker, args=(index, workers, child, request.name, reply.name, matrix_kwargs),
+                daemon=True)
+            process.start()
+            child.close()
+            self._channels.append(_Channel(parent, request, reply))
+            self._processes.append(process)
+            self._buffers += [request, reply]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    @property
+    def workers(self):
+        return len(self._channels)
+
+    def _call(self, index, op, value=None):
+        channel = self._channels[index]
+        channel.send(op, value)
+        return self._answer(channel)
+
+    def _answer(self, channel):
+        status, result = channel.recv()
+        if status == "error":
+            raise result
+        return result
+
+    def _fan_out(self, op, values=None):
+        # Send everything first so the workers run concurrently, then collect
+        targets = values if values is not None else {i: None for i in range(self.workers)}
+        for index, value in targets.items():
+            self._channels[index].send(op, value)
+        # Drain every reply before raising, or the other channels fall out of step
+        replies = {index: self._channels[index].recv() for index in targets}
+        for status, result in replies.values():
+            if status == "error":
+                raise result
+        return {index: result for index, (_, result) in replies.items()}
+
+    def store(self, symbol: str, context: dict = None):
+        self._pending[shard_of(symbol, self.workers)].append((symbol, context))
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            self.flush()
+
+    def store_many(self, items):
+        for symbol, context in items:
+            self.store(symbol, context)
+        self.flush()
+
+    def flush(self):
+        if self._pending_count:
+            batches, self._pending, self._pending_count = self._pending, defaultdict(list), 0
+            self._fan_out("store_many", dict(batches))
+
+    def retrieve(self, **criteria):
+        """ Declarative GlyphMatrix.retrieve; a symbol criterion hits a single shard """
+        self.flush()
+        if criteria.get("symbol") is not None:
+            return self._call(shard_of(criteria["symbol"], self.workers), "retrieve", criteria)
+        return [info for part in self._fan_out("retrieve", {i: criteria for i in range(self.workers)}).values()
+                for info in part]
+
+    def summarize(self):
+        self.flush()
+        return [symbol for part in self._fan_out("summarize").values() for symbol in part]
+
+    def summarize_by_emotion(self, counts=False):
+        self.flush()
+        merged = defaultdict(Counter)
+        for part in self._fan_out("summarize_by_emotion").values():
+            for emotion, symbols in part.items():
+                merged[emotion].update(symbols)
+        if counts:
+            return {emotion: dict(symbols) for emotion, symbols in merged.items()}
+        return {emotion: list(symbols.elements()) for emotion, symbols in merged.items()}
+
+    def forget(self, symbol_to_erase: str):
+        return self.forget_many((symbol_to_erase,))
+
+    def forget_many(self, symbols):
+        self.flush()
+        by_shard = defaultdict(list)
+        for symbol in symbols:
+            by_shard[shard_of(symbol, self.workers)].append(symbol)
+        return sum(self._fan_out("forget_many", dict(by_shard)).values())
+
+    def cycle_nodes(self):
+        """ Every shard cycles in parallel """
+        self.flush()
+        self._fan_out("cycle_nodes")
+
+    def prune_nodes(self):
+        self.flush()
+        self._fan_out("prune_nodes")
+
+    def __len__(self):
+        self.flush()
+        return sum(self._fan_out("len").values())
+
+    def close(self):
+        if not self._processes:
+            return
+        for channel in self._channels:
+            channel.send("stop", None)
+        for process in self._processes:
+            process.join(timeout=5)
+        for channel in self._channels:
+            channel.conn.close()
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink()
+        self._processes = []
@@ -0,0 +1,123 @@
+# Glyph Warehouse - Hierarchical LTM Index (Lyra v1.0)
+# ----------------------------------------------------
+# Trie over colon-separated species paths (e.g. "tone_0:anagram_0") with
+# node-id arrays at the leaves and a node count on every subtree, so prefix
+# queries, per-subtree counts and sorted walks never scan the whole archive.
+
+from array import array
+
+
+class WarehouseNode:
+    __slots__ = ("children", "ids", "count")
+
+    def __init__(self):
+        self.children = None  # segment -> WarehouseNode, created on first child
+        self.ids = None       # array('q') of node ids filed exactly at this path
+        self.count = 0        # ids filed in this subtree
+
+
+class GlyphWarehouse:
+    """
+    Compact trie keyed on path segments.
+    Example:
+        warehouse.insert("tone_0:anagram_3", node.id)
+        warehouse.count("tone_0")          # everything under tone_0
+        list(warehouse.items("tone_0"))    # [("tone_0:anagram_3", [id, ...]), ...] sorted
+    """
+    SEPARATOR = ":"
+
+    def __init__(self):
+        self.root = WarehouseNode()
+
+    def _split(self, path):
+        if not path:
+            return []
+        return path.split(self.SEPARATOR) if isinstance(path, str) else list(path)
+
+    def _find(self, parts):
+        node = self.root
+        for part in parts:
+            if node.children is None or part not in node.children:
+                return None
+            node = node.children[part]
+        return node
+
+    def insert(self, path, node_id):
+        node = self.root
+        node.count += 1
+        for part in self._split(path):
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = WarehouseNode()
+            child.count += 1
+            node = child
+        if node.ids is None:
+            node.ids = array("q")
+        node.ids.append(node_id)
+
+    def remove(self, path, node_id):
+        """ Unfiles node_id from path; returns False if it was not filed there """
+        parts = self._split(path)
+        trail = [self.root]
+        for part in parts:
+            children = trail[-1].children
+            if children is None or part not in children:
+                return False
+            trail.append(children[part])
+        leaf = trail[-1]
+        if leaf.ids is None or node_id not in leaf.ids:
+            return False
+        leaf.ids.remove(node_id)
+        if not leaf.ids:
+            leaf.ids = None
+        for node in trail:
+            node.count -= 1
+        # Prune emptied branches bottom-up
+        for depth in range(len(parts), 0, -1):
+            if trail[depth].count:
+                break
+            parent = trail[depth - 1]
+            del parent.children[parts[depth - 1]]
+            if not parent.children:
+                parent.children = None
+        return True
+
+    def count(self, prefix=""):
+        node = self._find(self._split(prefix))
+        return node.count if node is not None else 0
+
+    def items(self, prefix=""):
+        """ Yields (path, ids) for every filed path under prefix, in sorted order """
+        parts = self._split(prefix)
+        start = self._find(parts)
+        if start is None:
+            return
+        stack = [(start, parts)]
+        while stack:
+            node, path = stack.pop()
+            if node.ids is not None:
+                yield self.SEPARATOR.join(path), list(node.ids)
+            if node.children:
+                # Reverse-sorted push so the smallest segment is visited first
+                for part in sorted(node.children, reverse=True):
+                    stack.append((node.children[part], path + [part]))
+
+    def ids(self, prefix=""):
+        for _, ids in self.items(prefix):
+            yield from ids
+
+    def children(self, prefix=""):
+        """ Sorted (segment, subtree count) pairs directly below prefix """
+        node = self._find(self._split(prefix))
+        if node is None or not node.children:
+            return []
+        return [(part, node.children[part].count) for part in sorted(node.children)]
+
+    def __len__(self):
+        return self.root.count
+
+    def __contains__(self, path):
+        node = self._find(self._split(path))
+        return node is not None and node.ids is not None
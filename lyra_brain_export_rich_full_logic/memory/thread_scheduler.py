@@ -0,0 +1,217 @@
+# Thread Scheduler - Indexed Priority Queue with Aging (Lyra v2.2)
+# ----------------------------------------------------------------
+# Keeps every resident thread in an indexed min-heap so the manager can
+# add, reprioritize and evict in O(log n) instead of scanning all threads.
+#
+# Aging without touching: a thread idle since cycle t with base priority p
+# has effective priority p - rate * (now - t). Writing that as
+# (p + rate * t) - rate * now, the first term is a constant heap key and
+# the second is shared by every thread aging at the same rate, so the heap
+# order never changes as cycles pass. Emotional weight slows aging, so
+# threads are grouped into `levels` rate classes, one heap per class; the
+# victim is the lowest effective priority among the class heads.
+#
+# Example:
+#   scheduler = ThreadScheduler(aging_rate=0.8)
+#   scheduler.add("t1", priority=5, emotional_weight=0.2)
+#   scheduler.tick()               # O(1), no per-thread work
+#   scheduler.priority("t1")       # 5 - 0.8 * (1 - 0.2) = 4.36
+#   scheduler.evict()              # -> "t1"
+
+import itertools
+
+
+class IndexedHeap:
+    """ Binary min-heap of [key, seq, item] entries with an item -> position index """
+    def __init__(self):
+        self._entries = []
+        self._pos = {}
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def key(self, item):
+        return self._entries[self._pos[item]][0]
+
+    def push(self, item, key):
+        entry = [key, next(self._seq), item]
+        self._entries.append(entry)
+        self._pos[item] = len(self._entries) - 1
+        self._sift_up(len(self._entries) - 1)
+
+    def update(self, item, key):
+        i = self._pos[item]
+        entry = self._entries[i]
+        old, entry[0] = entry[0], key
+        if key < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, item):
+        i = self._pos.pop(item)
+        last = self._entries.pop()
+        if i < len(self._entries):
+            self._entries[i] = last
+            self._pos[last[2]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[2]])
+
+    def peek(self):
+        """ (key, item) of the minimum entry, or None when empty """
+        if not self._entries:
+            return None
+        entry = self._entries[0]
+        return entry[0], entry[2]
+
+    def items(self):
+        return [(entry[2], entry[0]) for entry in self._entries]
+
+    def _sift_up(self, i):
+        entries, pos = self._entries, self._pos
+        entry = entries[i]
+        while i:
+            parent = (i - 1) >> 1
+            above = entries[parent]
+            if above[:2] <= entry[:2]:
+                break
+            entries[i] = above
+            pos[above[2]] = i
+            i = parent
+        entries[i] = entry
+        pos[entry[2]] = i
+
+    def _sift_down(self, i):
+        entries, pos = self._entries, self._pos
+        n = len(entries)
+        entry = entries[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and entries[child + 1][:2] < entries[child][:2]:
+                child += 1
+            below = entries[child]
+            if entry[:2] <= below[:2]:
+                break
+            entries[i] = below
+            pos[below[2]] = i
+            i = child
+        entries[i] = entry
+        pos[entry[2]] = i
+
+
+class ThreadScheduler:
+    """
+    Priority queue over thread ids with time-based aging.
+    aging_rate is the priority lost per idle cycle by a thread with no
+    emotional weight; a thread with weight w ages at aging_rate * (1 - w),
+    with w rounded to one of `levels` steps between 0 and 1.
+    """
+    def __init__(self, aging_rate=0.8, levels=11):
+        self.aging_rate = aging_rate
+        self.levels = levels
+        self.now = 0
+        self._heaps = [IndexedHeap() for _ in range(levels)]
+        self._where = {}  # thread_id -> (level, base priority, last active cycle)
+
+    def _level(self, emotional_weight):
+        weight = min(max(emotional_weight, 0.0), 1.0)
+        return round(weight * (self.levels - 1))
+
+    def _rate(self, level):
+        return self.aging_rate * (1 - level / (self.levels - 1))
+
+    def _key(self, level, priority, since):
+        return priority + self._rate(level) * since
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, thread_id):
+        return thread_id in self._where
+
+    def tick(self, cycles=1):
+        """ Advances the clock; every thread ages implicitly, in O(1) """
+        self.now += cycles
+
+    def add(self, thread_id, priority, emotional_weight=0.0):
+        if thread_id in self._where:
+            self.remove(thread_id)
+        level = self._level(emotional_weight)
+        self._where[thread_id] = (level, priority, self.now)
+        self._heaps[level].push(thread_id, self._key(level, priority, self.now))
+
+    def remove(self, thread_id):
+        level, _, _ = self._where.pop(thread_id)
+        self._heaps[level].remove(thread_id)
+
+    def touch(self, thread_id):
+        """ Marks the thread active now, restoring its base priority """
+        level, priority, _ = self._where[thread_id]
+        self._where[thread_id] = (level, priority, self.now)
+        self._heaps[level].update(thread_id, self._key(level, priority, self.now))
+
+    def reprioritize(self, thread_id, priority=None, emotional_weight=None):
+        """ Sets a new base priority and/or emotional weight; the thread counts as active now """
+        level, old, _ = self._where[thread_id]
+        priority = old if priority is None else priority
+        new_level = level if emotional_weight is None else self._level(emotional_weight)
+        if new_level != level:
+            self._heaps[level].remove(thread_id)
+            self._where[thread_id] = (new_level, priority, self.now)
+            self._heaps[new_level].push(thread_id, self._key(new_level, priority, self.now))
+        else:
+            self._where[thread_id] = (level, priority, self.now)
+            self._heaps[level].update(thread_id, self._key(level, priority, self.now))
+
+    def priority(self, thread_id):
+        """ Effective (aged) priority """
+        level, priority, since = self._where[thread_id]
+        return priority - self._rate(level) * (self.now - since)
+
+    def idle(self, thread_id):
+        return self.now - self._where[thread_id][2]
+
+    def peek(self):
+        """ (thread_id, effective priority) of the next victim, or None """
+        best = None
+        for level, heap in enumerate(self._heaps):
+            head = heap.peek()
+            if head is None:
+                continue
+            effective = head[0] - self._rate(level) * self.now
+            if best is None or effective < best[1]:
+                best = (head[1], effective)
+        return best
+
+    def evict(self):
+        """ Removes and returns the thread with the lowest effective priority """
+        head = self.peek()
+        if head is None:
+            return None
+        self.remove(head[0])
+        return head[0]
+
+    def expired(self, floor=0.0):
+        """ Thread ids whose effective priority has fallen to floor or below, lowest first """
+        while True:
+            head = self.peek()
+            if head is None or head[1] > floor:
+                return
+            self.remove(head[0])
+            yield head[0]
+
+    def set_aging_rate(self, aging_rate):
+        """ Changes the rate for every thread, re-keying the heaps in O(n) """
+        self.aging_rate = aging_rate
+        for level, heap in enumerate(self._heaps):
+            rebuilt = IndexedHeap()
+            for thread_id, _ in heap.items():
+                _, priority, since = self._where[thread_id]
+                rebuilt.push(thread_id, self._key(level, priority, since))
+            self._heaps[level] = rebuilt